@@ -7,9 +7,25 @@ from datetime import datetime
 import pandas as pd
 import os
 import sys
+import json
+import uuid
 import queue
+import heapq
+import multiprocessing
+import argparse
 import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, unquote
 from decimal import Decimal, ROUND_HALF_UP
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is only needed for Parquet/Feather outputs
+    pa = None
 
 
 # ----------------- UI STYLING CONSTANTS ----------------- #
@@ -28,6 +44,70 @@ START_TIME = time.time()
 NULL_VALUE = -999.25
 ASCII_SEPARATOR = "     "  # Five spaces – only applied to LAS 1m
 EXPECTED_NPD_COLUMNS = 2
+RAW_INPUT_EXTENSIONS = (".csv", ".parquet")  # Raw time-indexed records, binned to depth on import
+RAW_DEPTH_COLUMN = "DBTM"                   # Bit depth column of raw records
+RAW_TIME_COLUMN = "TIME"
+RAW_CHUNK_ROWS = 1_000_000
+BIN_AGGREGATIONS = ("mean", "max", "last", "time-weighted")
+# Curves not listed here are averaged over each depth bin
+DEFAULT_BIN_AGGREGATIONS = {
+    "HKLX": "max", "TQX": "max",
+    "BDIA": "last", "TVA": "last", "BDTI": "last", "BDDI": "last", "BRVC": "last", "TCTI": "last"
+}
+FORMAT_CHUNK_ROWS = 10000                   # Rows formatted (and QC-checked) per block
+PARALLEL_EXPORT_MIN_ROWS = 20000            # Smaller fixed-width LAS files are not worth starting worker processes
+PARALLEL_EXPORT_WORKERS = None              # None uses every CPU core
+COLUMN_WIDTHS = [9, 11, 12, 11, 11, 11, 11, 11, 11, 13, 13, 11, 11, 13, 11, 13, 13, 12, 12, 13, 11, 11, 12, 11, 13, 15, 11, 11, 11, 11, 11, 11, 11, 11, 11, 16, 16, 16, 16, 16, 11, 11, 11, 11]
+ASCII_COLUMN_WIDTHS = [10, 11, 12, 11, 11, 11, 11, 11, 11, 13, 13, 11, 11, 13, 11, 13, 13, 12, 12, 13, 11, 11, 12, 11, 13, 15, 11, 11, 11, 11, 11, 11, 11, 11, 11, 16, 16, 16, 16, 16, 11, 11, 11, 11]
+# Plausible physical limits per curve; values outside are counted as out-of-range in the QC report
+QC_VALID_RANGES = {
+    "DEPT": (0, 15000), "DVER": (0, 15000), "BDIA": (0, 36), "ROPA": (0, 1000),
+    "HKLA": (0, 1000), "HKLX": (0, 1000), "WOBA": (0, 200), "TQA": (0, 200), "TQX": (0, 200),
+    "RPMA": (0, 1000), "RPMB": (0, 1000), "SPPA": (0, 1000), "TVA": (0, 2000), "MFIA": (0, 10000),
+    "MFOA": (0, 100), "MDIA": (0.5, 3.0), "MDOA": (0.5, 3.0), "MTIA": (-10, 200), "MTOA": (-10, 200),
+    "ECDT": (0.5, 3.0), "BDTI": (0, None), "BDDI": (0, None), "BRVC": (0, None), "TCTI": (0, None),
+    "FPPG": (0.5, 3.0), "DXC": (0, 5), "GASX": (0, 100), "HSX": (0, 1e6),
+    "MTHA": (0, 1e6), "ETHA": (0, 1e6), "PRPA": (0, 1e6), "IBTA": (0, 1e6), "NBTA": (0, 1e6),
+    "IPNA": (0, 1e6), "NPNA": (0, 1e6), "C1C2": (0, None), "C1C3": (0, None), "C1C4": (0, None),
+    "C1C5": (0, None), "LITH": (0, None), "CCAL": (0, 100), "CDOL": (0, 100),
+}
+QC_MAX_LISTED_GAPS = 20
+INDEX_SUFFIX = ".idx.npz"                   # Campaign index sidecar written next to every LAS output
+INDEX_BLOCK_METERS = 50.0                   # Depth block size of the campaign index min/max summaries
+INDEX_HEADER_FIELDS = ("COMP", "WELL", "FLD", "RIGN", "RIGTYP", "CREA", "STRT", "STOP", "STEP")
+SPLICE_RULES = ("newest", "non-null")       # How overlapping depths of several LAS runs are resolved
+SPLICE_CHUNK_ROWS = 50000
+# Input unit -> HEADER_TEMPLATE unit as (scale, offset): converted = value * scale + offset. Keys are lower case.
+UNIT_CONVERSIONS = {
+    ("ft", "m"): (0.3048, 0.0), ("mm", "in"): (1 / 25.4, 0.0), ("cm", "in"): (1 / 2.54, 0.0),
+    ("m/hr", "m/h"): (1.0, 0.0), ("ft/h", "m/h"): (0.3048, 0.0), ("ft/hr", "m/h"): (0.3048, 0.0), ("m/min", "m/h"): (60.0, 0.0),
+    ("klbf", "t"): (0.45359237, 0.0), ("lbf", "t"): (0.00045359237, 0.0), ("kn", "t"): (0.101971621, 0.0),
+    ("kkgf", "t"): (1.0, 0.0), ("kg", "t"): (0.001, 0.0), ("kgf", "t"): (0.001, 0.0), ("tonne", "t"): (1.0, 0.0),
+    ("knm", "kn.m"): (1.0, 0.0), ("n.m", "kn.m"): (0.001, 0.0), ("ft.lbf", "kn.m"): (0.0013558179483, 0.0),
+    ("kft.lbf", "kn.m"): (1.3558179483, 0.0), ("klbf.ft", "kn.m"): (1.3558179483, 0.0),
+    ("rpm", "1/min"): (1.0, 0.0), ("c/min", "1/min"): (1.0, 0.0),
+    ("psi", "bar"): (0.0689475729, 0.0), ("kpa", "bar"): (0.01, 0.0), ("mpa", "bar"): (10.0, 0.0),
+    ("bbl", "m3"): (0.158987294928, 0.0), ("l", "m3"): (0.001, 0.0),
+    ("gal/min", "l/min"): (3.785411784, 0.0), ("gpm", "l/min"): (3.785411784, 0.0),
+    ("bbl/min", "l/min"): (158.987294928, 0.0), ("m3/min", "l/min"): (1000.0, 0.0),
+    ("ppg", "g/cm3"): (0.119826427, 0.0), ("lbm/gal", "g/cm3"): (0.119826427, 0.0),
+    ("kg/m3", "g/cm3"): (0.001, 0.0), ("sg", "g/cm3"): (1.0, 0.0), ("g/cc", "g/cm3"): (1.0, 0.0),
+    ("degf", "degc"): (5 / 9, -160 / 9), ("c", "degc"): (1.0, 0.0), ("f", "degc"): (5 / 9, -160 / 9),
+    ("min", "h"): (1 / 60, 0.0), ("s", "h"): (1 / 3600, 0.0), ("hr", "h"): (1.0, 0.0),
+    ("rev", "krev"): (0.001, 0.0),
+}
+# Input mnemonics that name a HEADER_TEMPLATE curve differently
+MNEMONIC_ALIASES = {
+    "DEPTH": "DEPT", "MD": "DEPT", "TVD": "DVER", "ROP": "ROPA", "WOB": "WOBA", "SPP": "SPPA", "RPM": "RPMA",
+    "TGAS": "GASX", "H2S": "HSX", "C1": "MTHA", "C2": "ETHA", "C3": "PRPA", "IC4": "IBTA", "NC4": "NBTA",
+    "IC5": "IPNA", "NC5": "NPNA", "ECD": "ECDT",
+}
+# Accepted units of the LAS depth index; step sizes, actual depths and NPD depths are all in m
+DEPTH_INDEX_UNITS = ("m", "meter", "meters", "metre", "metres")
+# Units of input curves whatever their ~C entry says: the database exports hold BRVC in revs but label it krev
+FIXED_INPUT_UNITS = {"BRVC": "rev"}
+OUTPUT_OPTIONS = ["LAS 0.5m", "LAS 1m", "LAS 5m", "ASCII 0.5m", "ASCII 1m", "ASCII 5m"]
+COLUMNAR_FORMATS = {"Parquet": ".parquet", "Feather": ".feather", "CSV": ".csv"}
 
 # Utility functions for rounding numbers
 def round_three_decimals(number):
@@ -149,6 +229,29 @@ WLCT                    .Euc                                    :Hydrocarbon sho
 ~A
 """
 
+def parse_template_curves(template):
+    """Return (mnemonic, unit, description) tuples from the ~CURVE block of a header template."""
+    curves = []
+    in_curve_block = False
+    for line in template.splitlines():
+        if line.startswith("~"):
+            in_curve_block = line.startswith("~CURVE")
+            continue
+        if not in_curve_block or not line.strip() or line.startswith("#"):
+            continue
+        mnemonic, rest = line.split(".", 1)
+        unit = rest.split()[0] if rest and not rest[0].isspace() else ""
+        description = rest.split(":", 1)[1].strip() if ":" in rest else ""
+        curves.append((mnemonic.strip(), unit, description))
+    return curves
+
+# Curve mnemonics and units of the output files, in column order
+TEMPLATE_CURVES = parse_template_curves(HEADER_TEMPLATE)
+TEMPLATE_MNEMONICS = [mnemonic for mnemonic, _, _ in TEMPLATE_CURVES]
+TEMPLATE_INDEX = {mnemonic: idx for idx, mnemonic in enumerate(TEMPLATE_MNEMONICS)}
+# Columns kept on the 1m LAS rows outside the actual start depth/TD; every other column is nulled
+DEPTH_FIX_NULLED_COLUMNS = np.array([mnemonic not in ("DEPT", "DVER", "BDIA") for mnemonic in TEMPLATE_MNEMONICS])
+
 # ASCII header (extra newline removed)
 ASCII_HEADER = """Depth (m)\t  DVER (m)\t  BDIA (in)\tROPA (m/h)\t  HKLA (t)\t  HKLX (t)\t  WOBA (t)\tTQA (kN.m)\tTQX (kN.m)\tRPMA (1/min)\tRPMB (1/min)\tSPPA (bar)\t  TVA (m3)\tMFIA (L/min)\t  MFOA (%)\tMDIA (g/cm3)\tMDOA (g/cm3)\tMTIA (degC)\tMTOA (degC)\tECDT (g/cm3)\t  BDTI (h)\t  BDDI (m)\tBRVC (krev)\t  TCTI (h)\tFPPG (g/cm3)\tDXC (unitless)\t  GASX (%)\t HSX (ppm)\tMTHA (ppm)\tETHA (ppm)\tPRPA (ppm)\tIBTA (ppm)\tNBTA (ppm)\tIPNA (ppm)\tNPNA (ppm)\tC1C2 (unitless)\tC1C3 (unitless)\tC1C4 (unitless)\tC1C5 (unitless)\tLITH (unitless)\t  CCAL (%)\t  CDOL (%)\tWLFL (Euc)\tWLCT (Euc)	
 \n\n"""
@@ -169,6 +272,14 @@ class FileGenerationThread(threading.Thread):
         except Exception as e:
             self.queue.put(('ERROR', str(e)))
 
+class PrefetchCancelled(Exception):
+    """Raised inside a background prefetch whose input files were replaced by the user."""
+
+def raise_if_cancelled(cancel_event):
+    """Stop a background prefetch between files or chunks once its cancel event is set."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise PrefetchCancelled("Input prefetch cancelled.")
+
 # ----------------- DIALOG FUNCTIONS WITH BACK BUTTON SUPPORT ----------------- #
 # Each interactive dialog returns "BACK" when the Back button is pressed.
 def select_output_options(parent, update_progress):
@@ -180,7 +291,7 @@ def select_output_options(parent, update_progress):
     tk.Label(dialog, text="Select the outputs that you want to generate:", wraplength=280,
              font=UI_FONT, bg=UI_BG, fg=UI_FG).pack(pady=10)
     selections = {}
-    options = ["LAS 0.5m", "LAS 1m", "LAS 5m", "ASCII 0.5m", "ASCII 1m", "ASCII 5m"]
+    options = OUTPUT_OPTIONS
     checkbox_frame = tk.Frame(dialog, bg=UI_BG)
     checkbox_frame.pack(pady=10, padx=10, fill="x")
     checkbox_vars = {}
@@ -192,6 +303,16 @@ def select_output_options(parent, update_progress):
         if option == "LAS 1m":
             cb.config(font=UI_TITLE_FONT)
         cb.pack(anchor="w")
+    tk.Label(dialog, text="Columnar outputs for analytics (optional):", font=UI_FONT, bg=UI_BG, fg=UI_FG).pack(pady=(10, 0))
+    columnar_frame = tk.Frame(dialog, bg=UI_BG)
+    columnar_frame.pack(pady=5, padx=10)
+    for row, output_format in enumerate(COLUMNAR_FORMATS):
+        for column, step_name in enumerate(["0.5m", "1m", "5m"]):
+            option = f"{output_format} {step_name}"
+            var = tk.BooleanVar()
+            checkbox_vars[option] = var
+            tk.Checkbutton(columnar_frame, text=option, variable=var, font=UI_FONT, bg=UI_BG, fg=UI_FG,
+                           anchor="w", selectcolor=UI_BG).grid(row=row, column=column, sticky="w", padx=5)
     def submit_selection():
         for opt, var in checkbox_vars.items():
             if var.get():
@@ -206,8 +327,8 @@ def select_output_options(parent, update_progress):
     update_progress("Desired outputs collected from user. \nOutput selection completed.")
     return selections
 
-def select_las_file(parent, update_progress, selected_outputs):
-    """Step 2: Prompt user to select required LAS file(s) for chosen step sizes."""
+def required_steps_for(selected_outputs):
+    """Return the sorted input step sizes needed for the selected outputs."""
     required_steps = set()
     for opt in selected_outputs:
         if "0.5m" in opt:
@@ -216,8 +337,16 @@ def select_las_file(parent, update_progress, selected_outputs):
             required_steps.add(1.0)
         elif "5m" in opt:
             required_steps.add(5.0)
-    required_steps = sorted(required_steps)
+    return sorted(required_steps)
+
+def select_las_file(parent, update_progress, selected_outputs):
+    """Step 2: Prompt user to select required LAS file(s) for chosen step sizes.
+
+    Returns (selected files by step, per-curve bin aggregations chosen for a raw file).
+    """
+    required_steps = required_steps_for(selected_outputs)
     selected_files = {step: None for step in required_steps}
+    bin_aggregations = {}
     back_pressed = False
     messagebox.showwarning(
         "Input File Requirements",
@@ -244,6 +373,7 @@ def select_las_file(parent, update_progress, selected_outputs):
             return
         try:
             las = lasio.read(file_path)
+            check_las_depth_unit(las, file_path)
             depths = las.index
             if len(depths) < 2:
                 raise ValueError("LAS file does not contain enough depth values for validation.")
@@ -254,10 +384,61 @@ def select_las_file(parent, update_progress, selected_outputs):
                                      f"Please select a file with a {step} m step size.")
                 return
             selected_files[step] = file_path
-            row_widgets[step]["file_label"].config(text=file_path)
+            show_run_order(step)
             update_progress(f"Selected valid file for {step} m step: {file_path}")
         except Exception as e:
             messagebox.showerror("File Error", f"Error reading LAS file: {e}\nPlease select a valid file.")
+    def select_runs_for_step(step):
+        file_paths = filedialog.askopenfilenames(
+            title=f"Select the LAS runs to splice for {step} m step size",
+            filetypes=[("LAS files", "*.las"), ("All files", "*.*")]
+        )
+        if not file_paths:
+            return
+        try:
+            headers = [check_las_run_step(file_path, step) for file_path in file_paths]
+        except Exception as e:
+            messagebox.showerror("File Error", f"Error reading LAS run: {e}\nPlease select valid files.")
+            return
+        # File modification times change when runs are copied, so the order comes from the headers or the user
+        runs, dated = order_las_runs(file_paths, headers)
+        selected_files[step] = runs if len(runs) > 1 else runs[0]
+        show_run_order(step)
+        update_progress(f"Selected {len(runs)} LAS run(s) to splice for {step} m step, "
+                        f"{'ordered by header DATE' if dated else 'in the order selected'}; check the order before submitting.")
+    def show_run_order(step):
+        widgets = row_widgets[step]
+        if widgets.get("runs_frame") is not None:
+            widgets["runs_frame"].destroy()
+            widgets["runs_frame"] = None
+        runs = selected_files[step]
+        if not isinstance(runs, list):
+            widgets["file_label"].config(text=runs or "No file selected")
+            return
+        widgets["file_label"].config(text=f"{len(runs)} runs to splice (order below)")
+        runs_frame = tk.Frame(dialog, bg=UI_BG)
+        runs_frame.pack(fill="x", padx=30, pady=(0, 5), after=widgets["frame"])
+        tk.Label(runs_frame, text="Splice order, oldest first (later runs are newer):", font=UI_FONT, bg=UI_BG, fg=UI_FG).pack(anchor="w")
+        run_list = tk.Listbox(runs_frame, height=min(len(runs), 6), width=70, font=UI_FONT, bg=UI_ENTRY_BG)
+        run_list.pack(side=tk.LEFT, fill="x", expand=True)
+        for number, run in enumerate(runs, start=1):
+            run_list.insert(tk.END, f"{number}. {run}")
+        def move_run(offset):
+            selection = run_list.curselection()
+            if not selection:
+                return
+            idx = selection[0]
+            new_idx = idx + offset
+            if not 0 <= new_idx < len(runs):
+                return
+            runs[idx], runs[new_idx] = runs[new_idx], runs[idx]
+            show_run_order(step)
+            row_widgets[step]["run_list"].selection_set(new_idx)
+        tk.Button(runs_frame, text="Move Up", font=UI_FONT, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG,
+                  command=lambda: move_run(-1)).pack(side=tk.TOP, padx=5, pady=2)
+        tk.Button(runs_frame, text="Move Down", font=UI_FONT, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG,
+                  command=lambda: move_run(1)).pack(side=tk.TOP, padx=5, pady=2)
+        widgets["runs_frame"], widgets["run_list"] = runs_frame, run_list
     for step in required_steps:
         row = tk.Frame(dialog, bg=UI_BG)
         row.pack(fill="x", padx=10, pady=5)
@@ -268,11 +449,69 @@ def select_las_file(parent, update_progress, selected_outputs):
         select_button = tk.Button(row, text="Select File", font=UI_FONT, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG,
                                   relief="raised", command=lambda s=step: select_file_for_step(s))
         select_button.pack(side=tk.LEFT, padx=5)
+        runs_button = tk.Button(row, text="Splice Runs", font=UI_FONT, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG,
+                                relief="raised", command=lambda s=step: select_runs_for_step(s))
+        runs_button.pack(side=tk.LEFT, padx=5)
         row_widgets[step] = {"frame": row, "file_label": file_label}
+    splice_rule = tk.StringVar(value=SPLICE_RULES[0])
+    rule_row = tk.Frame(dialog, bg=UI_BG)
+    rule_row.pack(fill="x", padx=10, pady=5)
+    tk.Label(rule_row, text="Where spliced runs overlap, prefer:", font=UI_FONT, bg=UI_BG, fg=UI_FG).pack(side=tk.LEFT)
+    tk.OptionMenu(rule_row, splice_rule, *SPLICE_RULES).pack(side=tk.LEFT, padx=5)
+    def select_raw_file():
+        file_path = filedialog.askopenfilename(
+            title="Select a raw time-indexed drilling/gas data file",
+            filetypes=[("Raw data files", "*.csv *.parquet"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        if not is_raw_input(file_path):
+            messagebox.showerror("File Error", "Raw data must be a CSV or Parquet file.")
+            return
+        for step in required_steps:
+            selected_files[step] = file_path
+            show_run_order(step)
+            row_widgets[step]["file_label"].config(text=f"{file_path} (binned to {step} m)")
+        update_progress(f"Selected raw time-indexed file for all step sizes: {file_path}")
+    raw_row = tk.Frame(dialog, bg=UI_BG)
+    raw_row.pack(fill="x", padx=10, pady=5)
+    tk.Label(raw_row, text=f"Or bin raw time-indexed records ({RAW_DEPTH_COLUMN} bit depth column) for all steps:",
+             font=UI_FONT, bg=UI_BG, fg=UI_FG).pack(side=tk.LEFT)
+    tk.Button(raw_row, text="Select Raw File", font=UI_FONT, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG,
+              relief="raised", command=select_raw_file).pack(side=tk.LEFT, padx=5)
+    aggregation_row = tk.Frame(dialog, bg=UI_BG)
+    aggregation_row.pack(fill="x", padx=30, pady=(0, 5))
+    tk.Label(aggregation_row, text="Raw bins aggregate", font=UI_FONT, bg=UI_BG, fg=UI_FG).pack(side=tk.LEFT)
+    curve_choice = tk.StringVar(value=TEMPLATE_MNEMONICS[1])
+    aggregation_choice = tk.StringVar()
+    def current_aggregation(mnemonic):
+        return bin_aggregations.get(mnemonic, DEFAULT_BIN_AGGREGATIONS.get(mnemonic, "mean"))
+    def show_curve_aggregation(*_):
+        aggregation_choice.set(current_aggregation(curve_choice.get()))
+    curve_choice.trace_add("write", show_curve_aggregation)
+    show_curve_aggregation()
+    tk.OptionMenu(aggregation_row, curve_choice, *TEMPLATE_MNEMONICS[1:]).pack(side=tk.LEFT, padx=5)
+    tk.Label(aggregation_row, text="by", font=UI_FONT, bg=UI_BG, fg=UI_FG).pack(side=tk.LEFT)
+    tk.OptionMenu(aggregation_row, aggregation_choice, *BIN_AGGREGATIONS).pack(side=tk.LEFT, padx=5)
+    aggregation_label = tk.Label(aggregation_row, text="Defaults in use", font=UI_FONT, bg=UI_BG, fg=UI_FG, wraplength=300)
+    def set_aggregation():
+        mnemonic = curve_choice.get()
+        if aggregation_choice.get() == DEFAULT_BIN_AGGREGATIONS.get(mnemonic, "mean"):
+            bin_aggregations.pop(mnemonic, None)
+        else:
+            bin_aggregations[mnemonic] = aggregation_choice.get()
+        aggregation_label.config(text=", ".join(f"{curve} {agg}" for curve, agg in bin_aggregations.items()) or "Defaults in use")
+        update_progress(f"Raw records of {mnemonic} will be binned by {current_aggregation(mnemonic)}.")
+    tk.Button(aggregation_row, text="Set", font=UI_FONT, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG,
+              relief="raised", command=set_aggregation).pack(side=tk.LEFT, padx=5)
+    aggregation_label.pack(side=tk.LEFT, padx=10)
     def submit_selection():
         if any(selected_files[step] is None for step in required_steps):
             messagebox.showerror("Incomplete Selection", "Please select a file for every required step size before submitting.")
         else:
+            for step in required_steps:
+                if isinstance(selected_files[step], list):
+                    selected_files[step] = {"runs": selected_files[step], "rule": splice_rule.get()}
             dialog.destroy()
     def back():
         nonlocal back_pressed
@@ -287,7 +526,9 @@ def select_las_file(parent, update_progress, selected_outputs):
     parent.wait_window(dialog)
     if back_pressed:
         return "BACK"
-    return selected_files
+    # The aggregations only apply when a raw file is binned
+    raw_selected = any(isinstance(selection, str) and is_raw_input(selection) for selection in selected_files.values())
+    return selected_files, dict(bin_aggregations) if raw_selected else {}
 
 def collect_header_info(parent, update_progress):
     """Step 3: Collect well header information."""
@@ -417,6 +658,15 @@ def collect_depth_info(parent, update_progress):
         return "BACK"
     return depth_answers
 
+def read_npd_codes(file_path):
+    """Read [depth, NPD code] pairs from an Excel file with exactly two numeric columns."""
+    df = pd.read_excel(file_path)
+    if len(df.columns) != EXPECTED_NPD_COLUMNS:
+        raise ValueError("Excel file must contain exactly two columns. Please check your NPD file and try again.")
+    if not all(pd.api.types.is_numeric_dtype(df[col]) for col in df.columns):
+        raise ValueError("Both columns must contain only numbers. Please check your NPD file and try again.")
+    return df.values.tolist()
+
 def select_npd_file(parent, update_progress):
     """Step 5: Handle NPD code file selection. If 'No NPD' is chosen, returns (False, None)."""
     back_pressed = False
@@ -435,18 +685,14 @@ def select_npd_file(parent, update_progress):
         if file_path:
             if file_path.lower().endswith(('.xlsx', '.xls')):
                 try:
-                    df = pd.read_excel(file_path)
-                    if len(df.columns) != EXPECTED_NPD_COLUMNS:
-                        messagebox.showerror("Error", "Excel file must contain exactly two columns. Please check your NPD file and try again.")
-                        sys.exit(1)
-                    if not all(pd.api.types.is_numeric_dtype(df[col]) for col in df.columns):
-                        messagebox.showerror("Error", "Both columns must contain only numbers. Please check your NPD file and try again.")
-                        sys.exit(1)
-                    npd_data = df.values.tolist()
+                    npd_data = read_npd_codes(file_path)
                     update_progress("NPD file processed successfully.")
                     nonlocal npd_result
                     npd_result = (True, npd_data)
                     dialog.destroy()
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
+                    sys.exit(1)
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to read Excel file: {str(e)}")
                     sys.exit(1)
@@ -476,7 +722,8 @@ def select_output_directories(parent, selected_options):
     back_pressed = False
     dir_container = tk.Frame(parent, bg=UI_BG)
     dir_container.pack(pady=10, padx=10, fill="x")
-    las_dir, ascii_dir = None, None
+    las_dir, ascii_dir, columnar_dir = None, None, None
+    wants_columnar = any(opt.split()[0] in COLUMNAR_FORMATS for opt in selected_options)
     if any(opt.startswith('LAS') for opt in selected_options):
         las_frame = tk.Frame(dir_container, bg=UI_BG)
         las_frame.pack(pady=10, padx=10, fill="x")
@@ -505,6 +752,20 @@ def select_output_directories(parent, selected_options):
                 if os.listdir(ascii_dir):
                     messagebox.showwarning("Warning", "The selected folder contains files. Existing files with the same name may be deleted and replaced.")
         tk.Button(ascii_frame, text="Browse", command=browse_ascii, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG, font=UI_FONT).pack(pady=5)
+    if wants_columnar:
+        columnar_frame = tk.Frame(dir_container, bg=UI_BG)
+        columnar_frame.pack(pady=10, padx=10, fill="x")
+        tk.Label(columnar_frame, text="Select Directory for output Parquet/Feather/CSV Files. \nFiles will be named automatically.", bg=UI_BG, fg=UI_FG, font=UI_FONT).pack()
+        columnar_label = tk.Label(columnar_frame, text="No directory selected", bg=UI_BG, fg=UI_FG, font=UI_FONT)
+        columnar_label.pack()
+        def browse_columnar():
+            nonlocal columnar_dir
+            columnar_dir = filedialog.askdirectory(title="Select Directory for Parquet/Feather/CSV Files")
+            if columnar_dir:
+                columnar_label.config(text=f"Columnar Directory: {columnar_dir}")
+                if os.listdir(columnar_dir):
+                    messagebox.showwarning("Warning", "The selected folder contains files. Existing files with the same name may be deleted and replaced.")
+        tk.Button(columnar_frame, text="Browse", command=browse_columnar, bg=UI_BUTTON_BG, fg=UI_BUTTON_FG, font=UI_FONT).pack(pady=5)
     def on_continue():
         if any(opt.startswith('LAS') for opt in selected_options) and not las_dir:
             messagebox.showerror("Error", "Please select a directory for LAS Files.")
@@ -512,6 +773,9 @@ def select_output_directories(parent, selected_options):
         if any(opt.startswith('ASCII') for opt in selected_options) and not ascii_dir:
             messagebox.showerror("Error", "Please select a directory for ASCII Files.")
             return
+        if wants_columnar and not columnar_dir:
+            messagebox.showerror("Error", "Please select a directory for Parquet/Feather/CSV Files.")
+            return
         dir_container.destroy()
     def on_back():
         nonlocal back_pressed
@@ -524,9 +788,460 @@ def select_output_directories(parent, selected_options):
     parent.wait_window(dir_container)
     if back_pressed:
         return "BACK"
-    return (las_dir, ascii_dir)
+    return (las_dir, ascii_dir, columnar_dir)
+
+# ----------------- RAW TIME-INDEXED DATA BINNING -----------------#
+def is_raw_input(file_path):
+    """Return True if the file holds raw time-indexed records instead of depth-indexed LAS."""
+    return file_path.lower().endswith(RAW_INPUT_EXTENSIONS)
+
+def iter_raw_record_chunks(file_path, chunk_rows=RAW_CHUNK_ROWS):
+    """Yield DataFrames of at most chunk_rows raw records from a CSV or Parquet file."""
+    if file_path.lower().endswith(".parquet"):
+        if pa is None:
+            raise ImportError("pyarrow is required to read Parquet raw data (pip install pyarrow).")
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(file_path, chunksize=chunk_rows)
+
+def raw_times_to_seconds(column):
+    """Convert a raw time column (numbers or date strings) to float seconds."""
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(dtype=float)
+    timestamps = pd.to_datetime(column).to_numpy(dtype="datetime64[ns]")
+    return timestamps.astype("int64") / 1e9
+
+class DepthBinner:
+    """Accumulate raw records into fixed depth bins; bin d holds the records with d - step < depth <= d."""
+    def __init__(self, step, mnemonics, aggregations=None):
+        self.step = step
+        self.mnemonics = list(mnemonics)
+        aggregations = {**DEFAULT_BIN_AGGREGATIONS, **(aggregations or {})}
+        self.columns = {agg: [] for agg in BIN_AGGREGATIONS}
+        for j, mnemonic in enumerate(self.mnemonics):
+            agg = aggregations.get(mnemonic, "mean")
+            if agg not in BIN_AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation '{agg}' for {mnemonic}; use one of {BIN_AGGREGATIONS}.")
+            self.columns[agg].append(j)
+        self.first_bin = None
+        self.bin_count = 0
+        self.previous_time = None
+        # Accumulators are (bins x curves of that aggregation), grown when a chunk reaches new depths
+        self.acc = {}
+        for name, agg, fill in (("sum", "mean", 0.0), ("count", "mean", 0.0),
+                                ("max", "max", -np.inf),
+                                ("last_time", "last", -np.inf), ("last_value", "last", np.nan),
+                                ("tw_sum", "time-weighted", 0.0), ("tw_weight", "time-weighted", 0.0),
+                                ("tw_plain_sum", "time-weighted", 0.0), ("tw_count", "time-weighted", 0.0)):
+            self.acc[name] = (agg, fill, np.full((0, len(self.columns[agg])), fill))
+
+    def _ensure_range(self, low_bin, high_bin):
+        if self.first_bin is None:
+            self.first_bin = low_bin
+        new_first = min(self.first_bin, low_bin)
+        new_count = max(self.first_bin + self.bin_count, high_bin + 1) - new_first
+        if new_first == self.first_bin and new_count == self.bin_count:
+            return
+        offset = self.first_bin - new_first
+        for name, (agg, fill, array) in self.acc.items():
+            grown = np.full((new_count, array.shape[1]), fill)
+            grown[offset:offset + self.bin_count] = array
+            self.acc[name] = (agg, fill, grown)
+        self.first_bin, self.bin_count = new_first, new_count
+
+    def add_chunk(self, depths, times, values):
+        """Add one chunk of records: depths and times are 1-D, values is (records x mnemonics)."""
+        valid_depth = ~np.isnan(depths) & (depths != NULL_VALUE)
+        depths, times, values = depths[valid_depth], times[valid_depth], values[valid_depth]
+        if depths.size == 0:
+            return
+        # Durations for time-weighting: each record stands for the time since the previous record
+        durations = np.diff(times, prepend=times[0] if self.previous_time is None else self.previous_time)
+        np.clip(durations, 0, None, out=durations)
+        self.previous_time = times[-1]
+        bins = np.ceil(np.round(depths / self.step, 9)).astype(np.int64)
+        self._ensure_range(int(bins.min()), int(bins.max()))
+        rows = bins - self.first_bin
+        for agg, columns in self.columns.items():
+            if not columns:
+                continue
+            subset = values[:, columns]
+            valid = ~np.isnan(subset) & (subset != NULL_VALUE)
+            width = len(columns)
+            flat_index = (rows[:, None] * width + np.arange(width))[valid]
+            subset_values = subset[valid]
+            size = self.bin_count * width
+            if agg == "mean":
+                self._array("sum")[:] += np.bincount(flat_index, weights=subset_values, minlength=size).reshape(-1, width)
+                self._array("count")[:] += np.bincount(flat_index, minlength=size).reshape(-1, width)
+            elif agg == "max":
+                np.maximum.at(self._array("max").reshape(-1), flat_index, subset_values)
+            elif agg == "last":
+                record_times = np.broadcast_to(times[:, None], subset.shape)[valid]
+                last_time = self._array("last_time").reshape(-1)
+                np.maximum.at(last_time, flat_index, record_times)
+                latest = record_times == last_time[flat_index]
+                self._array("last_value").reshape(-1)[flat_index[latest]] = subset_values[latest]
+            else:
+                weights = np.broadcast_to(durations[:, None], subset.shape)[valid]
+                self._array("tw_sum")[:] += np.bincount(flat_index, weights=subset_values * weights, minlength=size).reshape(-1, width)
+                self._array("tw_weight")[:] += np.bincount(flat_index, weights=weights, minlength=size).reshape(-1, width)
+                self._array("tw_plain_sum")[:] += np.bincount(flat_index, weights=subset_values, minlength=size).reshape(-1, width)
+                self._array("tw_count")[:] += np.bincount(flat_index, minlength=size).reshape(-1, width)
+
+    def _array(self, name):
+        return self.acc[name][2]
+
+    def result(self):
+        """Return (bin depths, values per mnemonic) with NULL_VALUE in bins that received no data."""
+        depths = (self.first_bin + np.arange(self.bin_count)) * self.step if self.bin_count else np.empty(0)
+        values = np.full((self.bin_count, len(self.mnemonics)), NULL_VALUE)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            aggregated = {
+                "mean": np.where(self._array("count") > 0, self._array("sum") / self._array("count"), np.nan),
+                "max": np.where(np.isinf(self._array("max")), np.nan, self._array("max")),
+                "last": self._array("last_value"),
+                # Bins whose records carry no duration (single sample) fall back to the plain mean
+                "time-weighted": np.where(self._array("tw_weight") > 0, self._array("tw_sum") / self._array("tw_weight"),
+                                          np.where(self._array("tw_count") > 0,
+                                                   self._array("tw_plain_sum") / self._array("tw_count"), np.nan)),
+            }
+        for agg, columns in self.columns.items():
+            if columns:
+                values[:, columns] = np.where(np.isnan(aggregated[agg]), NULL_VALUE, aggregated[agg])
+        return depths, values
+
+def bin_raw_records(file_path, steps, aggregations=None, depth_column=RAW_DEPTH_COLUMN, time_column=RAW_TIME_COLUMN,
+                    chunk_rows=RAW_CHUNK_ROWS, update_progress=None, cancel_event=None):
+    """Bin a raw time-indexed file into depth-indexed buffers for every step in a single chunked pass.
+
+    Returns ({step: data buffer in HEADER_TEMPLATE curve order}, curve index map).
+    """
+    template_mnemonics = [mnemonic for mnemonic, _, _ in TEMPLATE_CURVES]
+    binners = None
+    record_count = 0
+    for chunk in iter_raw_record_chunks(file_path, chunk_rows):
+        raise_if_cancelled(cancel_event)
+        chunk.columns = [str(col).strip().upper() for col in chunk.columns]
+        if binners is None:
+            if depth_column not in chunk.columns:
+                raise ValueError(f"Raw data file has no '{depth_column}' bit depth column.")
+            curves = [m for m in template_mnemonics[1:] if m in chunk.columns and m not in (depth_column, time_column)]
+            binners = {step: DepthBinner(step, curves, aggregations) for step in steps}
+        depths = pd.to_numeric(chunk[depth_column], errors="coerce").to_numpy(dtype=float)
+        if time_column in chunk.columns:
+            times = raw_times_to_seconds(chunk[time_column])
+        else:
+            times = np.arange(record_count, record_count + len(chunk), dtype=float)
+        values = np.column_stack([pd.to_numeric(chunk[m], errors="coerce").to_numpy(dtype=float) for m in curves]) \
+            if curves else np.empty((len(chunk), 0))
+        for binner in binners.values():
+            binner.add_chunk(depths, times, values)
+        record_count += len(chunk)
+        if update_progress is not None:
+            update_progress(f"{record_count} raw records binned...")
+    if binners is None:
+        raise ValueError("Raw data file contains no records.")
+    curve_index_map = {mnemonic: idx for idx, mnemonic in enumerate(template_mnemonics)}
+    data_buffers = {}
+    for step, binner in binners.items():
+        depths, values = binner.result()
+        data_buffer = np.full((len(depths), len(template_mnemonics)), NULL_VALUE)
+        data_buffer[:, 0] = depths
+        data_buffer[:, [curve_index_map[m] for m in binner.mnemonics]] = values
+        data_buffers[step] = data_buffer
+    return data_buffers, curve_index_map
+
+# ----------------- MULTI-RUN LAS SPLICING -----------------#
+def read_las_header(file_path):
+    """Read only the header sections of a LAS file; returns (LAS object, number of lines before the data).
+
+    The result is reused until the file changes, so checking a run in the dialog and splicing it parse the header once.
+    """
+    stat = os.stat(file_path)
+    return _read_las_header(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=32)
+def _read_las_header(file_path, mtime_ns, size):
+    las = lasio.read(file_path, ignore_data=True)
+    with open(file_path, 'r', encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f):
+            if line.lstrip().upper().startswith("~A"):
+                return las, line_number + 1
+    raise ValueError(f"{file_path} has no ~A data section.")
+
+def check_las_depth_unit(las, file_path):
+    """Raise ValueError unless the depth index and STEP of a LAS file are in m (a missing unit is taken as m)."""
+    depth_unit = las.curves[0].unit.strip() if len(las.curves) else ""
+    step_unit = las.well["STEP"].unit.strip() if "STEP" in las.well else ""
+    for unit in (depth_unit, step_unit):
+        if unit and unit.lower() not in DEPTH_INDEX_UNITS:
+            raise ValueError(f"The depth index of {file_path} is in '{unit}'. Only LAS files indexed in m are supported; "
+                             f"please export the file with depths in m.")
+
+def check_las_run_step(file_path, step):
+    """Raise ValueError unless the STEP of a LAS run header matches the expected step size.
+
+    Returns the header as read by read_las_header.
+    """
+    las, skip_lines = read_las_header(file_path)
+    check_las_depth_unit(las, file_path)
+    header_step = las.well["STEP"].value if "STEP" in las.well else ""
+    if header_step in (None, "") or not np.isclose(abs(float(header_step)), step):
+        raise ValueError(f"The depth step size of {file_path} is {header_step} m instead of {step} m.")
+    return las, skip_lines
+
+def las_run_date(las):
+    """Return the DATE (or CREA) header field of a LAS run as a timestamp, or None if it has no valid date."""
+    for field in ("DATE", "CREA"):
+        if field in las.well:
+            value = pd.to_datetime(str(las.well[field].value), errors="coerce")
+            if not pd.isna(value):
+                return value
+    return None
+
+def order_las_runs(file_paths, headers):
+    """Order LAS runs oldest first by their header date when every run has one, else keep the given order.
+
+    Returns (ordered file paths, True if the header dates were used).
+    """
+    dates = [las_run_date(las) for las, _ in headers]
+    if len(file_paths) < 2 or any(date is None for date in dates):
+        return list(file_paths), False
+    return [file_path for _, file_path in sorted(zip(dates, file_paths), key=lambda item: item[0])], True
+
+def iter_las_run_rows(file_path, skip_lines, column_order, null_value, step, origin, newness, chunk_rows):
+    """Yield (depth grid index, -newness, row) for one LAS run, reading its data chunk_rows lines at a time."""
+    previous_index = None
+    for chunk in pd.read_csv(file_path, sep=r"\s+", header=None, skiprows=skip_lines, chunksize=chunk_rows,
+                             comment="#", encoding_errors="replace"):
+        block = chunk.to_numpy(dtype=float)[:, column_order]
+        block[block == null_value] = NULL_VALUE
+        grid = np.round((block[:, 0] - origin) / step)
+        if not np.allclose(origin + grid * step, block[:, 0], atol=step * 1e-3):
+            raise ValueError(f"{file_path} has depths that are not on the {step} m step grid.")
+        grid = grid.astype(np.int64)
+        if np.any(np.diff(grid) <= 0) or (previous_index is not None and grid[0] <= previous_index):
+            raise ValueError(f"Depths in {file_path} are not strictly increasing.")
+        previous_index = grid[-1]
+        for index, row in zip(grid.tolist(), block):
+            yield index, -newness, row
+
+def splice_las_runs(file_paths, step, rule="newest", chunk_rows=SPLICE_CHUNK_ROWS, update_progress=None, cancel_event=None):
+    """Merge several LAS runs of one step size by depth into one continuous data buffer.
+
+    Runs are listed oldest first. Overlapping depths keep the newest run's row ("newest"), or the newest
+    non-null value of every curve ("non-null"). Depth gaps between runs are filled with null rows.
+    Returns (data buffer, curve index map, LAS header object of the first run).
+    """
+    if rule not in SPLICE_RULES:
+        raise ValueError(f"Unknown splice rule '{rule}'; use one of {SPLICE_RULES}.")
+    headers = [check_las_run_step(file_path, step) for file_path in file_paths]
+    base_las = headers[0][0]
+    mnemonics = [curve.mnemonic.upper() for curve in base_las.curves]
+    origin = float(base_las.well["STRT"].value) if "STRT" in base_las.well else 0.0
+    sources = []
+    for newness, (file_path, (las, skip_lines)) in enumerate(zip(file_paths, headers)):
+        run_mnemonics = [curve.mnemonic.upper() for curve in las.curves]
+        if sorted(run_mnemonics) != sorted(mnemonics):
+            raise ValueError(f"{file_path} does not have the same curves as {file_paths[0]}.")
+        null_value = float(las.well["NULL"].value) if "NULL" in las.well else NULL_VALUE
+        column_order = [run_mnemonics.index(mnemonic) for mnemonic in mnemonics]
+        sources.append(iter_las_run_rows(file_path, skip_lines, column_order, null_value, step, origin, newness, chunk_rows))
+    # Rows arrive in depth order and, at equal depth, newest run first
+    merged = heapq.merge(*sources, key=lambda item: item[:2])
+    blocks, block, filled = [], np.empty((chunk_rows, len(mnemonics))), 0
+    current_index, current_row, overlaps = None, None, 0
+    def emit(row):
+        nonlocal block, filled
+        block[filled] = row
+        filled += 1
+        if filled == chunk_rows:
+            raise_if_cancelled(cancel_event)
+            blocks.append(block)
+            block, filled = np.empty((chunk_rows, len(mnemonics))), 0
+    for index, _, row in merged:
+        if index == current_index:
+            overlaps += 1
+            if rule == "non-null":
+                missing = (current_row == NULL_VALUE) | np.isnan(current_row)
+                current_row[missing] = row[missing]
+            continue
+        if current_row is not None:
+            emit(current_row)
+            for gap_index in range(current_index + 1, index):
+                gap_row = np.full(len(mnemonics), NULL_VALUE)
+                gap_row[0] = origin + gap_index * step
+                emit(gap_row)
+        current_index, current_row = index, row.copy()
+    if current_row is not None:
+        emit(current_row)
+    blocks.append(block[:filled])
+    if update_progress is not None:
+        update_progress(f"{len(file_paths)} LAS runs spliced for {step} m step ({overlaps} overlapping rows resolved, rule: {rule}).")
+    curve_index_map = {mnemonic: idx for idx, mnemonic in enumerate(mnemonics)}
+    return np.vstack(blocks), curve_index_map, base_las
+
+# ----------------- CURVE SCHEMA -----------------#
+class CurveSchema:
+    """Projection of one input file's curves onto the HEADER_TEMPLATE curves, compiled once per file."""
+    def __init__(self, input_mnemonics):
+        positions = {}
+        for idx, mnemonic in enumerate(input_mnemonics):
+            positions.setdefault(MNEMONIC_ALIASES.get(mnemonic, mnemonic), idx)
+        # The first (index) curve of a LAS file is the depth
+        positions.setdefault("DEPT", 0)
+        self.input_count = len(input_mnemonics)
+        self.gather = np.array([positions.get(mnemonic, -1) for mnemonic in TEMPLATE_MNEMONICS])
+        self.missing_columns = self.gather < 0
+        self.missing = [mnemonic for mnemonic, idx in zip(TEMPLATE_MNEMONICS, self.gather) if idx < 0]
+        used = set(self.gather[~self.missing_columns].tolist())
+        self.extra = [mnemonic for idx, mnemonic in enumerate(input_mnemonics) if idx not in used]
+        self.is_identity = self.input_count == len(TEMPLATE_MNEMONICS) and np.array_equal(self.gather, np.arange(self.input_count))
+
+    def project(self, data_buffer):
+        """Return the data with one column per template curve; missing curves are filled with nulls."""
+        if self.is_identity:
+            return data_buffer
+        projected = np.take(data_buffer, np.where(self.missing_columns, 0, self.gather), axis=1)
+        projected[:, self.missing_columns] = NULL_VALUE
+        return projected
+
+    def project_units(self, input_units):
+        """Map the input curve units (in input column order) to the template mnemonics."""
+        return {mnemonic: ("" if idx < 0 else input_units[idx]) for mnemonic, idx in zip(TEMPLATE_MNEMONICS, self.gather)}
+
+    def describe(self):
+        """Return a progress message about missing and ignored curves, or None if the input matches the template."""
+        notes = []
+        if self.missing:
+            notes.append(f"Curves missing from the input (filled with {NULL_VALUE}): {', '.join(self.missing)}.")
+        if self.extra:
+            notes.append(f"Extra input curves ignored: {', '.join(self.extra)}.")
+        return " ".join(notes) if notes else None
+
+# ----------------- UNIT CONVERSION -----------------#
+def compile_unit_conversion(curve_units, curve_index_map, column_count):
+    """Build per-column scale and offset vectors converting input curve units to the HEADER_TEMPLATE units.
+
+    Returns (scale, offset, applied conversions, curves with an unknown unit).
+    """
+    target_units = {mnemonic: unit for mnemonic, unit, _ in TEMPLATE_CURVES}
+    scale, offset = np.ones(column_count), np.zeros(column_count)
+    conversions, unknown = [], []
+    for mnemonic, idx in curve_index_map.items():
+        if mnemonic not in target_units or idx >= column_count:
+            continue
+        source = FIXED_INPUT_UNITS.get(mnemonic) or (curve_units.get(mnemonic) or "").strip()
+        target = target_units[mnemonic]
+        if not source or source.lower() == target.lower():
+            continue
+        factor = UNIT_CONVERSIONS.get((source.lower(), target.lower()))
+        if factor is None:
+            unknown.append(f"{mnemonic} ({source})")
+            continue
+        scale[idx], offset[idx] = factor
+        conversions.append(f"{mnemonic} {source} -> {target}")
+    return scale, offset, conversions, unknown
+
+def convert_input_units(data_buffer, curve_units, curve_index_map, update_progress):
+    """Convert every curve to its HEADER_TEMPLATE unit with one broadcast scale/offset, leaving nulls untouched."""
+    if data_buffer.size == 0:
+        return data_buffer
+    valid = ~np.isnan(data_buffer) & (data_buffer != NULL_VALUE)
+    # Curves without values (missing from the input and filled with nulls) need no conversion
+    present = valid.any(axis=0)
+    curve_index_map = {mnemonic: idx for mnemonic, idx in curve_index_map.items() if idx < len(present) and present[idx]}
+    scale, offset, conversions, unknown = compile_unit_conversion(curve_units, curve_index_map, data_buffer.shape[1])
+    if conversions:
+        np.copyto(data_buffer, data_buffer * scale + offset, where=valid)
+        update_progress("Units converted: " + ", ".join(conversions) + ".")
+    if unknown:
+        update_progress("No unit conversion known for: " + ", ".join(unknown) + "; values kept as exported.")
+    return data_buffer
+
+def load_step_inputs(selected_files, update_progress, input_cache=None, bin_aggregations=None, cancel_event=None):
+    """Load the input of every step: a LAS file, spliced LAS runs ({"runs": [...], "rule": ...}) or raw records.
+
+    Every input is projected onto the HEADER_TEMPLATE curves and converted to their units. Setting cancel_event
+    stops the loading between files and chunks with PrefetchCancelled.
+    Returns (data buffers by step, curve index map of the template curves).
+    """
+    las_data_buffers = {}
+    raw_inputs = {}
+    for step, file_path in selected_files.items():
+        if isinstance(file_path, str) and is_raw_input(file_path):
+            raw_inputs.setdefault(file_path, []).append(step)
+    for file_path, steps in raw_inputs.items():
+        # Binned buffers already follow the template curve order; raw records carry no units
+        binned_buffers, _ = bin_raw_records(file_path, steps, bin_aggregations, update_progress=update_progress,
+                                            cancel_event=cancel_event)
+        for binned_buffer in binned_buffers.values():
+            convert_input_units(binned_buffer, {}, TEMPLATE_INDEX, update_progress)
+        las_data_buffers.update(binned_buffers)
+        update_progress(f"Raw input file binned to {', '.join(f'{s} m' for s in steps)} depth steps.")
+    for step, file_path in selected_files.items():
+        raise_if_cancelled(cancel_event)
+        try:
+            if isinstance(file_path, dict):
+                data, _, las = splice_las_runs(file_path["runs"], step, file_path.get("rule", SPLICE_RULES[0]),
+                                               update_progress=update_progress, cancel_event=cancel_event)
+            elif is_raw_input(file_path):
+                continue
+            elif input_cache is not None:
+                data, _, las = input_cache.get(file_path, step)
+            else:
+                data, _, las = load_las_input(file_path)
+        except PrefetchCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to read LAS input for {step} m: {e}") from e
+        schema = CurveSchema([curve.mnemonic.upper() for curve in las.curves])
+        schema_notes = schema.describe()
+        if schema_notes:
+            update_progress(f"{step} m input: {schema_notes}")
+        data = schema.project(data)
+        curve_units = schema.project_units([curve.unit for curve in las.curves])
+        las_data_buffers[step] = convert_input_units(data, curve_units, TEMPLATE_INDEX, update_progress)
+        update_progress(f"LAS input file for {step} m imported.")
+    return las_data_buffers, dict(TEMPLATE_INDEX)
 
 # ----------------- DATA PROCESSING & FILE GENERATION -----------------#
+def apply_npd_codes(data_buffer, npd_result, update_progress):
+    """Write the NPD codes into the LITH column of the rows at their depths."""
+    if npd_result is None:
+        return
+    has_npd, npd_data = npd_result
+    if has_npd and npd_data is not None:
+        for depth_val, npd_code in npd_data:
+            mask = (data_buffer[:, 0] == float(depth_val))
+            data_buffer[mask, TEMPLATE_INDEX["LITH"]] = float(npd_code)
+        update_progress("NPD codes applied to 1m data.")
+
+def prefetch_step_inputs(selected_files, selected_options, bin_aggregations=None, cancel_event=None, queue=None):
+    """Load the inputs and run the header-independent processing while the user fills in the dialogs.
+
+    Progress messages are posted to the queue as ('PROGRESS', message). NPD codes and the actual start
+    depth/TD do not affect the rest of the processing, so step 6 applies them to the prefetched buffers.
+    """
+    def update_progress(message):
+        if queue is not None:
+            queue.put(('PROGRESS', message))
+    las_data_buffers, curve_index_map = load_step_inputs(selected_files, update_progress, bin_aggregations=bin_aggregations,
+                                                         cancel_event=cancel_event)
+    # Raw buffers are kept unchanged for the STRT/STOP header values of step 7
+    data_half_meter, _, data_one_meter, data_five_meter = process_data_buffer(
+        las_data_buffers.get(0.5, np.empty((0, 0))).copy(), las_data_buffers.get(1.0, np.empty((0, 0))).copy(),
+        las_data_buffers.get(5.0, np.empty((0, 0))).copy(), curve_index_map, (False, None), update_progress, selected_options
+    )
+    raise_if_cancelled(cancel_event)
+    update_progress("Input files prepared in the background.")
+    return {
+        "las_data_buffers": las_data_buffers, "curve_index_map": curve_index_map,
+        "data_half_meter": data_half_meter, "data_one_meter": data_one_meter, "data_five_meter": data_five_meter,
+    }
+
 def process_data_buffer(data_buffer0_5, data_buffer1, data_buffer5,
                         curve_index_map, npd_result, update_progress, selected_options):
     """Process the data buffers for 0.5m, 1m, and 5m data."""
@@ -540,16 +1255,8 @@ def process_data_buffer(data_buffer0_5, data_buffer1, data_buffer5,
             return data_buffer
         intended_parameters = {name: curve_index_map[name.upper()]
                                for name in intended_curve_names if name.upper() in curve_index_map}
-        if apply_npd and "LITH" in intended_parameters and npd_result is not None:
-            has_npd, npd_data = npd_result
-            if has_npd and npd_data is not None:
-                for depth_val, npd_code in npd_data:
-                    mask = (data_buffer[:, 0] == float(depth_val))
-                    data_buffer[mask, 39] = float(npd_code)
-                update_progress("NPD codes applied to 1m data.")
-        if "BRVC" in curve_index_map:
-            data_buffer[:, curve_index_map["BRVC"]] /= 1000
-            update_progress("Revs per minute – drill bit, cumulative, converted to Krev ( /1000).")
+        if apply_npd and "LITH" in intended_parameters:
+            apply_npd_codes(data_buffer, npd_result, update_progress)
         if "GASX" in curve_index_map:
             data_buffer[:, curve_index_map["GASX"]] = np.vectorize(round_three_decimals)(data_buffer[:, curve_index_map["GASX"]])
             update_progress("Total gas (GASX) values rounded and set to 3 decimal points.")
@@ -589,53 +1296,393 @@ def process_data_buffer(data_buffer0_5, data_buffer1, data_buffer5,
 
     return data_half_meter, data_one_meter_las, data_one_meter_ascii, data_five_meter
 
-def format_data(data_subset, las, use_ascii_delimiter=False, ascii_output=False):
-    """Format data rows."""
-    formatted_lines = []
-    COLUMN_WIDTHS = [9, 11, 12, 11, 11, 11, 11, 11, 11, 13, 13, 11, 11, 13, 11, 13, 13, 12, 12, 13, 11, 11, 12, 11, 13, 15, 11, 11, 11, 11, 11, 11, 11, 11, 11, 16, 16, 16, 16, 16, 11, 11, 11, 11]
-    ASCII_COLUMN_WIDTHS = [10, 11, 12, 11, 11, 11, 11, 11, 11, 13, 13, 11, 11, 13, 11, 13, 13, 12, 12, 13, 11, 11, 12, 11, 13, 15, 11, 11, 11, 11, 11, 11, 11, 11, 11, 16, 16, 16, 16, 16, 11, 11, 11, 11]
-    widths = ASCII_COLUMN_WIDTHS if ascii_output else COLUMN_WIDTHS
-    for row in data_subset:
-        formatted_row = []
-        for j, value in enumerate(row):
-            mnemonic = las[j].mnemonic.upper()
-            if value == NULL_VALUE or np.isnan(value):
-                formatted_value = str(NULL_VALUE)
+class CurveQCStats:
+    """Per-curve QC statistics (nulls, min/max/mean, out-of-range values, depth gaps) gathered block by block."""
+    def __init__(self, mnemonics, step):
+        self.mnemonics = [mnemonic.upper() for mnemonic in mnemonics]
+        self.step = step
+        n = len(self.mnemonics)
+        self.rows = 0
+        self.nulls = np.zeros(n, dtype=np.int64)
+        self.out_of_range = np.zeros(n, dtype=np.int64)
+        self.minimum = np.full(n, np.inf)
+        self.maximum = np.full(n, -np.inf)
+        self.total = np.zeros(n)
+        limits = [QC_VALID_RANGES.get(mnemonic, (None, None)) for mnemonic in self.mnemonics]
+        self.lower = np.array([-np.inf if low is None else low for low, _ in limits])
+        self.upper = np.array([np.inf if high is None else high for _, high in limits])
+        self.first_depth = None
+        self.last_depth = None
+        self.gap_count = 0
+        self.missing_rows = 0
+        self.gaps = []
+
+    def update(self, block):
+        """Add a block of data rows (rows x curves) to the statistics."""
+        if block.size == 0:
+            return
+        is_null = np.isnan(block) | (block == NULL_VALUE)
+        valid = ~is_null
+        self.rows += block.shape[0]
+        self.nulls += is_null.sum(axis=0)
+        self.minimum = np.minimum(self.minimum, np.where(valid, block, np.inf).min(axis=0))
+        self.maximum = np.maximum(self.maximum, np.where(valid, block, -np.inf).max(axis=0))
+        self.total += np.where(valid, block, 0.0).sum(axis=0)
+        self.out_of_range += (valid & ((block < self.lower) | (block > self.upper))).sum(axis=0)
+        self._add_gaps(block[:, 0] if self.last_depth is None else np.concatenate(([self.last_depth], block[:, 0])))
+        if self.first_depth is None:
+            self.first_depth = block[0, 0]
+        self.last_depth = block[-1, 0]
+
+    def merge(self, other):
+        """Add the statistics of the rows following this block, e.g. those gathered by another worker."""
+        if other.rows == 0:
+            return
+        if self.last_depth is not None:
+            self._add_gaps(np.array([self.last_depth, other.first_depth]))
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.out_of_range += other.out_of_range
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self.total += other.total
+        self.gap_count += other.gap_count
+        self.missing_rows += other.missing_rows
+        self.gaps += other.gaps[:max(0, QC_MAX_LISTED_GAPS - len(self.gaps))]
+        if self.first_depth is None:
+            self.first_depth = other.first_depth
+        self.last_depth = other.last_depth
+
+    def _add_gaps(self, depths):
+        steps = np.diff(depths)
+        gap_positions = np.nonzero(steps > self.step * 1.001)[0]
+        self.gap_count += len(gap_positions)
+        self.missing_rows += int(np.round(steps[gap_positions] / self.step).sum()) - len(gap_positions)
+        for pos in gap_positions[:max(0, QC_MAX_LISTED_GAPS - len(self.gaps))]:
+            self.gaps.append((depths[pos], depths[pos + 1]))
+
+    def curve_rows(self):
+        """Yield (mnemonic, nulls, min, max, mean, out-of-range count) per curve."""
+        valid_counts = self.rows - self.nulls
+        for j, mnemonic in enumerate(self.mnemonics):
+            if valid_counts[j]:
+                yield mnemonic, self.nulls[j], self.minimum[j], self.maximum[j], self.total[j] / valid_counts[j], self.out_of_range[j]
             else:
-                if mnemonic == "DXC":
-                    formatted_value = f"{value:.5f}"
-                elif mnemonic in ["GASX", "MDIA", "MDOA", "ECDT", "BDTI", "BDDI", "BRVC", "LITH"]:
-                    formatted_value = f"{value:.3f}"
-                elif mnemonic in ["C1C2", "C1C3", "C1C4", "C1C5", "Depth", "DVER", "ROPA", "TQA", "TQX", "TVA", "MFIA", "TCTI", "BDIA"]:
-                    formatted_value = f"{value:.2f}"
-                elif mnemonic in ["HKLA", "HKLX", "WOBA", "SPPA", "MTIA", "MTOA"]:
-                    formatted_value = f"{value:.1f}"
-                elif mnemonic in ["RPMA", "RPMB", "HSX", "MTHA", "ETHA", "PRPA", "IBTA", "NBTA", "IPNA", "NPNA"]:
-                    formatted_value = f"{value:.0f}"
-                else:
-                    formatted_value = f"{value:.2f}"
-            formatted_row.append(formatted_value)
-        if use_ascii_delimiter:
-            formatted_line = ASCII_SEPARATOR.join(formatted_row)
-        else:
-            if ascii_output:
-                formatted_line = formatted_row[0].rjust(widths[0]) + "".join(
-                    f"\t{v:>{widths[i] - 1}}" for i, v in enumerate(formatted_row[1:], start=1)
-                )
+                yield mnemonic, self.nulls[j], None, None, None, self.out_of_range[j]
+
+    def report(self, filename):
+        """Return the sidecar QC report text."""
+        lines = [f"QC REPORT FOR {filename}",
+                 f"Generated: {datetime.now().strftime('%m/%d/%Y %H:%M:%S')}",
+                 f"Rows: {self.rows}    Step: {self.step} m    Null value: {NULL_VALUE}",
+                 f"Depth gaps: {self.gap_count} ({self.missing_rows} missing rows)"]
+        lines += [f"  Gap from {start:.2f} m to {end:.2f} m" for start, end in self.gaps]
+        if self.gap_count > len(self.gaps):
+            lines.append(f"  ... {self.gap_count - len(self.gaps)} more gaps not listed")
+        lines += ["", f"{'MNEM':<8}{'NULLS':>10}{'MIN':>14}{'MAX':>14}{'MEAN':>14}{'OUT OF RANGE':>14}"]
+        for mnemonic, nulls, minimum, maximum, mean, out_of_range in self.curve_rows():
+            if mean is None:
+                lines.append(f"{mnemonic:<8}{nulls:>10}{'-':>14}{'-':>14}{'-':>14}{out_of_range:>14}")
             else:
-                formatted_line = "".join(f"{v:>{widths[i]}}" for i, v in enumerate(formatted_row))
+                lines.append(f"{mnemonic:<8}{nulls:>10}{minimum:>14.3f}{maximum:>14.3f}{mean:>14.3f}{out_of_range:>14}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, filename):
+        """Return a short QC summary for the progress panel."""
+        empty = [m for m, nulls, *_ in self.curve_rows() if nulls == self.rows]
+        flagged = [f"{m} ({count})" for m, *_, count in self.curve_rows() if count]
+        return (f"QC {filename}: {self.rows} rows, {self.gap_count} depth gap(s), "
+                f"{len(empty)} all-null curve(s), out-of-range: {', '.join(flagged) if flagged else 'none'}.")
+
+def write_qc_report(qc_stats, output_dir, filename, update_progress):
+    """Save the QC sidecar next to an output file and show its summary in the progress panel."""
+    report_name = f"{filename}.qc.txt"
+    try:
+        with open(os.path.join(output_dir, report_name), 'w', encoding="utf-8") as f:
+            f.write(qc_stats.report(filename))
+        update_progress(qc_stats.summary(filename))
+    except Exception as e:
+        update_progress(f"Error saving {report_name}: {e}")
+
+def value_format(mnemonic):
+    """Return the printf-style format used for a curve's values in the LAS/ASCII outputs."""
+    if mnemonic == "DXC":
+        return "%.5f"
+    if mnemonic in ["GASX", "MDIA", "MDOA", "ECDT", "BDTI", "BDDI", "BRVC", "LITH"]:
+        return "%.3f"
+    if mnemonic in ["C1C2", "C1C3", "C1C4", "C1C5", "Depth", "DVER", "ROPA", "TQA", "TQX", "TVA", "MFIA", "TCTI", "BDIA"]:
+        return "%.2f"
+    if mnemonic in ["HKLA", "HKLX", "WOBA", "SPPA", "MTIA", "MTOA"]:
+        return "%.1f"
+    if mnemonic in ["RPMA", "RPMB", "HSX", "MTHA", "ETHA", "PRPA", "IBTA", "NBTA", "IPNA", "NPNA"]:
+        return "%.0f"
+    return "%.2f"
+
+# Value format of every output column, resolved once instead of per cell
+COLUMN_VALUE_FORMATS = [value_format(mnemonic) for mnemonic in TEMPLATE_MNEMONICS]
+COLUMN_DECIMALS = np.array([int(spec[2:-1]) for spec in COLUMN_VALUE_FORMATS])
+
+def format_values(values, spec):
+    """Format a column of values as a fixed-width bytes array, writing the null value for nulls."""
+    cells = np.char.mod(spec, values)
+    null = str(NULL_VALUE)
+    cells = cells.astype(f"S{max(cells.dtype.itemsize // 4, len(null))}")
+    cells[(values == NULL_VALUE) | np.isnan(values)] = null.encode()
+    return cells
+
+class FormattedCellCache:
+    """Formatted value cells per data buffer, shared by the LAS and ASCII layouts of the same step.
+
+    Cells are kept per block of FORMAT_CHUNK_ROWS rows as one fixed-width bytes array per column, and release() drops
+    the buffers of a step once its last layout has been written. The QC statistics of each buffer are gathered as its
+    blocks are formatted.
+    """
+    def __init__(self):
+        self.entries = []
+
+    def _entry(self, data_subset, step):
+        for entry in self.entries:
+            if entry["data"] is data_subset:
+                return entry
+        entry = {"data": data_subset, "step": step, "blocks": [], "base": None, "changed": None,
+                 "qc": CurveQCStats(TEMPLATE_MNEMONICS, step)}
+        # The LAS and ASCII 1m buffers differ only by NPD codes and the depth fixes, so only those cells are re-formatted
+        for other in self.entries:
+            data = other["data"]
+            if (data.shape != data_subset.shape or not data.size
+                    or data[0, 0] != data_subset[0, 0] or data[-1, 0] != data_subset[-1, 0]):
+                continue
+            changed = ~((data == data_subset) | (np.isnan(data) & np.isnan(data_subset)))
+            if changed.mean() <= 0.5:
+                entry["base"], entry["changed"] = other, changed
+                break
+        self.entries.append(entry)
+        return entry
 
-        formatted_lines.append(formatted_line + "\n")
+    def blocks(self, data_subset, step):
+        """Yield (first row, column cell arrays) per block of a buffer, formatting each block only once per step."""
+        entry = self._entry(data_subset, step)
+        for index, start in enumerate(range(0, len(data_subset), FORMAT_CHUNK_ROWS)):
+            if index == len(entry["blocks"]):
+                entry["blocks"].append(self._format_block(entry, index, start))
+                if entry["qc"].rows == start:
+                    entry["qc"].update(data_subset[start:start + FORMAT_CHUNK_ROWS])
+            yield start, entry["blocks"][index]
+
+    def qc(self, data_subset, step):
+        """Return the QC statistics of a buffer gathered while its blocks were formatted."""
+        return self._entry(data_subset, step)["qc"]
+
+    def set_qc(self, data_subset, step, qc_stats):
+        """Use the QC statistics gathered by the parallel LAS writer, so other layouts of the buffer skip them."""
+        self._entry(data_subset, step)["qc"] = qc_stats
+
+    @staticmethod
+    def _format_block(entry, index, start):
+        block = entry["data"][start:start + FORMAT_CHUNK_ROWS]
+        base = entry["base"]
+        if base is None or index >= len(base["blocks"]):
+            return [format_values(block[:, j], COLUMN_VALUE_FORMATS[j]) for j in range(block.shape[1])]
+        changed = entry["changed"][start:start + FORMAT_CHUNK_ROWS]
+        columns = []
+        for j, column in enumerate(base["blocks"][index]):
+            rows = np.nonzero(changed[:, j])[0]
+            if rows.size:
+                cells = format_values(block[rows, j], COLUMN_VALUE_FORMATS[j])
+                column = column.astype(f"S{max(column.dtype.itemsize, cells.dtype.itemsize)}")
+                column[rows] = cells
+            columns.append(column)
+        return columns
+
+    def release(self, step):
+        """Drop the formatted cells of every buffer of a step."""
+        self.entries = [entry for entry in self.entries if entry["step"] != step]
+
+def assemble_lines(columns, widths, use_ascii_delimiter, ascii_output):
+    """Lay out a block of formatted columns as LAS fixed-width, LAS 1m separated or tab-separated ASCII lines."""
+    columns = [column.astype(str).tolist() for column in columns]
+    if use_ascii_delimiter:
+        return [ASCII_SEPARATOR.join(cells) + "\n" for cells in zip(*columns)]
+    if ascii_output:
+        padded = [[value.rjust(widths[0]) for value in columns[0]]] + [
+            ["\t" + value.rjust(widths[j] - 1) for value in column] for j, column in enumerate(columns[1:], start=1)
+        ]
+    else:
+        padded = [[value.rjust(widths[j]) for value in column] for j, column in enumerate(columns)]
+    return ["".join(cells) + "\n" for cells in zip(*padded)]
+
+def format_data(data_subset, step, use_ascii_delimiter=False, ascii_output=False, cell_cache=None):
+    """Format data rows as output lines.
+
+    Pass the same cell_cache for every layout of a run so numbers are converted to text, and QC statistics gathered,
+    only once per step.
+    """
+    formatted_lines = []
+    widths = ASCII_COLUMN_WIDTHS if ascii_output else COLUMN_WIDTHS
+    if len(data_subset) == 0:
+        return formatted_lines
+    for _, columns in (cell_cache or FormattedCellCache()).blocks(data_subset, step):
+        formatted_lines.extend(assemble_lines(columns, widths, use_ascii_delimiter, ascii_output))
     return formatted_lines
 
+def write_fixed_width_rows(save_path, data_offset, row_width, first_row, data_block, column_formats, step):
+    """Worker: format a block of rows straight into its slice of a preallocated, memory-mapped LAS file.
+
+    Returns (True, QC statistics of the block), or (False, None), leaving the file to be rewritten sequentially, if
+    a value is wider than its column.
+    """
+    out = np.memmap(save_path, dtype=np.uint8, mode="r+", offset=data_offset + first_row * row_width,
+                    shape=(len(data_block), row_width))
+    position = 0
+    for j, (column_format, width) in enumerate(column_formats):
+        values = data_block[:, j]
+        cells = np.char.mod(column_format, values)
+        cells[(values == NULL_VALUE) | np.isnan(values)] = str(NULL_VALUE).rjust(width).encode()
+        if cells.dtype.itemsize > width and np.char.str_len(cells).max() > width:
+            return False, None
+        out[:, position:position + width] = cells.astype(f"S{width}").view(np.uint8).reshape(-1, width)
+        position += width
+    out[:, position:] = np.frombuffer(os.linesep.encode(), dtype=np.uint8)
+    out.flush()
+    qc_stats = CurveQCStats(TEMPLATE_MNEMONICS, step)
+    for start in range(0, len(data_block), FORMAT_CHUNK_ROWS):
+        qc_stats.update(data_block[start:start + FORMAT_CHUNK_ROWS])
+    return True, qc_stats
+
+def write_las_fixed_width_parallel(save_path, header_lines, data_subset, step, workers=None):
+    """Write a fixed-width LAS file with several processes formatting disjoint row ranges into a memory-mapped file.
+
+    Every row has the same byte width, so each row's offset is known before formatting. Returns (written, QC
+    statistics merged from the workers); written is False when a value overflows its column width, and the caller
+    then rewrites the file with the sequential path.
+    """
+    widths = COLUMN_WIDTHS[:data_subset.shape[1]]
+    column_formats = [((f"%{width}" + COLUMN_VALUE_FORMATS[j][1:]).encode(), width) for j, width in enumerate(widths)]
+    # Match the text-mode newline translation of the sequential writer
+    header_bytes = "".join(header_lines).replace("\n", os.linesep).encode("utf-8")
+    row_width = sum(widths) + len(os.linesep)
+    row_count = len(data_subset)
+    with open(save_path, 'wb') as f:
+        f.write(header_bytes)
+        f.truncate(len(header_bytes) + row_count * row_width)
+    workers = workers or PARALLEL_EXPORT_WORKERS or os.cpu_count() or 1
+    bounds = np.linspace(0, row_count, workers + 1).astype(int)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(write_fixed_width_rows, save_path, len(header_bytes), row_width, start,
+                                   data_subset[start:stop], column_formats, step)
+                   for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        results = [future.result() for future in futures]
+    if not all(written for written, _ in results):
+        return False, None
+    # The last row has no line break
+    with open(save_path, 'r+b') as f:
+        f.truncate(len(header_bytes) + row_count * row_width - len(os.linesep))
+    qc_stats = CurveQCStats(TEMPLATE_MNEMONICS, step)
+    for _, partial in results:
+        qc_stats.merge(partial)
+    return True, qc_stats
+
 def update_step_header(header_lines, step_value):
     """Update the STEP value in the LAS header."""
     return [line.replace("XX", f"{step_value:.1f}", 1) if line.strip().startswith("STEP") else line for line in header_lines]
 
-def generate_output_files(selected_options, las_dir, ascii_dir, data_buffer, data_one_meter_las, data_one_meter_ascii, data_five_meter, las,
-                          modified_header_lines0_5, modified_header_lines1, modified_header_lines5, update_progress):
+def load_las_input(file_path, step=None):
+    """Read a LAS input file and return its data matrix, curve index map and LAS object."""
+    las = lasio.read(file_path)
+    check_las_depth_unit(las, file_path)
+    if step is not None:
+        depths = las.index
+        if len(depths) < 2:
+            raise ValueError("LAS file does not contain enough depth values for validation.")
+        step_size = depths[1] - depths[0]
+        if step_size != step:
+            raise ValueError(f"The depth step size of {file_path} is {step_size} m instead of {step} m.")
+    curve_index_map = {curve.mnemonic.upper(): idx for idx, curve in enumerate(las.curves)}
+    return np.array(las.data.copy()), curve_index_map, las
+
+def apply_actual_depths(data_one_meter_las, actual_depths, update_progress):
+    """Null the first/last 1m LAS rows lying outside the actual start depth and TD (first 3 columns kept)."""
+    if actual_depths is None or data_one_meter_las is None or data_one_meter_las.shape[0] == 0:
+        return
+    if data_one_meter_las[-1, 0] > float(actual_depths[1]):
+        update_progress("Detected: Last row of 1m LAS depth > actual TD")
+        data_one_meter_las[-1, DEPTH_FIX_NULLED_COLUMNS] = NULL_VALUE
+    if data_one_meter_las[0, 0] < float(actual_depths[0]):
+        update_progress("Detected: First row of 1m LAS depth < actual start depth")
+        data_one_meter_las[0, DEPTH_FIX_NULLED_COLUMNS] = NULL_VALUE
+
+def build_header_lines(header_answers, data_buffer, date_string):
+    """Fill the LAS header template with the well answers and the depth range of a data buffer."""
+    field_mapping = {
+        "COMP": header_answers[0], "WELL": header_answers[1],
+        "STRT": str(data_buffer[0, 0]), "STOP": str(data_buffer[-1, 0]),
+        "FLD": header_answers[2], "RIGN": header_answers[3],
+        "RIGTYP": header_answers[4], "CREA.": date_string
+    }
+    modified_header_lines = HEADER_TEMPLATE.splitlines(keepends=True)
+    for field, new_value in field_mapping.items():
+        for i, line in enumerate(modified_header_lines):
+            if field in line.split():
+                padded_value = new_value + " " * (20 - len(new_value)) if len(new_value) < 21 else new_value + " "
+                modified_header_lines[i] = line.replace("XX", padded_value, 1)
+                break
+    return modified_header_lines
+
+def build_well_metadata(header_answers, date_string):
+    """Return the well header fields stored as metadata in the columnar outputs."""
+    return {
+        "COMP": header_answers[0], "WELL": header_answers[1],
+        "FLD": header_answers[2], "RIGN": header_answers[3],
+        "RIGTYP": header_answers[4], "CREA": date_string, "NULL": NULL_VALUE
+    }
+
+def write_columnar_file(data_subset, output_format, save_path, metadata):
+    """Write a processed buffer as a Parquet, Feather or CSV table keeping curve units and well header fields.
+
+    Parquet and Feather keep them in the schema metadata, CSV in a <file>.csv.json sidecar.
+    """
+    mnemonics = [mnemonic for mnemonic, _, _ in TEMPLATE_CURVES]
+    if data_subset.shape[1] != len(mnemonics):
+        raise ValueError(f"Expected {len(mnemonics)} curves in the data, found {data_subset.shape[1]}.")
+    # Null values are stored as real nulls so analytics tools do not have to filter -999.25
+    values = np.where(data_subset == NULL_VALUE, np.nan, data_subset)
+    if output_format == "CSV":
+        # Plain CSV for any reader; the header fields and curve units go to a <file>.csv.json sidecar
+        pd.DataFrame(values, columns=mnemonics).to_csv(save_path, index=False)
+        sidecar = {
+            "metadata": {field: str(value) for field, value in metadata.items()},
+            "curves": [{"mnemonic": mnemonic, "unit": unit, "description": description}
+                       for mnemonic, unit, description in TEMPLATE_CURVES]
+        }
+        with open(save_path + ".json", 'w', encoding="utf-8") as f:
+            json.dump(sidecar, f, indent=2)
+        return
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet and Feather outputs (pip install pyarrow).")
+    schema = pa.schema(
+        [pa.field(mnemonic, pa.float64(), metadata={"unit": unit, "description": description})
+         for mnemonic, unit, description in TEMPLATE_CURVES],
+        metadata={field: str(value) for field, value in metadata.items()}
+    )
+    table = pa.Table.from_arrays([pa.array(values[:, j], from_pandas=True) for j in range(values.shape[1])], schema=schema)
+    if output_format == "Parquet":
+        pq.write_table(table, save_path)
+    else:
+        feather.write_feather(table, save_path)
+
+def generate_output_files(selected_options, las_dir, ascii_dir, data_buffer, data_one_meter_las, data_one_meter_ascii, data_five_meter,
+                          modified_header_lines0_5, modified_header_lines1, modified_header_lines5, update_progress,
+                          columnar_dir=None, well_metadata=None):
     """Generate selected output files."""
     update_progress("Output files are being processed and saved...")
+    cell_cache = FormattedCellCache()
+    # The formatted cells of a step are dropped once its last LAS/ASCII layout has been written
+    layouts_left = Counter(float(option.split()[1].rstrip("m")) for option in selected_options
+                           if option.startswith(("LAS", "ASCII")))
+    def layout_written(step):
+        layouts_left[step] -= 1
+        if layouts_left[step] <= 0:
+            cell_cache.release(step)
     for option in selected_options:
         if option.startswith("LAS") and las_dir:
             if "0.5m" in option:
@@ -657,36 +1704,60 @@ def generate_output_files(selected_options, las_dir, ascii_dir, data_buffer, dat
             else:
                 continue
             las_header = update_step_header(header_lines.copy(), step)
-            formatted_data = format_data(data_subset, las, use_ascii_delimiter=use_delimiter, ascii_output=False)
-            if formatted_data:
-                formatted_data[-1] = formatted_data[-1].rstrip("\n")
-            content = las_header + formatted_data
             filename = f"MUD_LOG_{step_name}.las"
             save_path = os.path.join(las_dir, filename)
-            try:
-                with open(save_path, 'w', encoding="utf-8") as f:
-                    f.writelines(content)
-                update_progress(f"{filename} generated and saved successfully.")
-            except Exception as e:
-                update_progress(f"Error saving {filename}: {e}")
+            written = False
+            if not use_delimiter and len(data_subset) >= PARALLEL_EXPORT_MIN_ROWS:
+                try:
+                    written, qc_stats = write_las_fixed_width_parallel(save_path, las_header, data_subset, step)
+                    if written:
+                        cell_cache.set_qc(data_subset, step, qc_stats)
+                        update_progress(f"{filename} generated and saved successfully.")
+                    else:
+                        update_progress(f"A value in {filename} is wider than its column; writing it sequentially.")
+                except Exception as e:
+                    update_progress(f"Parallel export of {filename} unavailable ({e}); writing it sequentially.")
+            if not written:
+                formatted_data = format_data(data_subset, step, use_ascii_delimiter=use_delimiter, ascii_output=False,
+                                             cell_cache=cell_cache)
+                if formatted_data:
+                    formatted_data[-1] = formatted_data[-1].rstrip("\n")
+                content = las_header + formatted_data
+                try:
+                    with open(save_path, 'w', encoding="utf-8") as f:
+                        f.writelines(content)
+                    written = True
+                    update_progress(f"{filename} generated and saved successfully.")
+                except Exception as e:
+                    update_progress(f"Error saving {filename}: {e}")
+            write_qc_report(cell_cache.qc(data_subset, step), las_dir, filename, update_progress)
+            if written and len(data_subset):
+                try:
+                    metadata = dict(well_metadata or {})
+                    metadata.update({"STRT": data_subset[0, 0], "STOP": data_subset[-1, 0], "STEP": f"{step:.1f}"})
+                    write_index_entry(save_path, data_subset, metadata)
+                except Exception as e:
+                    update_progress(f"Could not write the campaign index of {filename}: {e}")
+            layout_written(step)
 
         elif option.startswith("ASCII") and ascii_dir:
             if "0.5m" in option:
                 data_subset = data_buffer
-                step_name = "0.5m"
+                step, step_name = 0.5, "0.5m"
                 update_progress("ASCII 0.5 components prepared for generation\n Please wait...")
             elif "1m" in option:
                 data_subset = data_one_meter_ascii
-                step_name = "1m"  # Fix: Assign step_name for ASCII 1m
+                step, step_name = 1.0, "1m"  # Fix: Assign step_name for ASCII 1m
                 update_progress("ASCII 1m components prepared for generation\n Please wait...")
             elif "5m" in option:
                 data_subset = data_five_meter
-                step_name = "5m"
+                step, step_name = 5.0, "5m"
                 update_progress("ASCII 5m components prepared for generation\n Please wait...")
             else:
                 continue
             ascii_header = [ASCII_HEADER]
-            formatted_data = format_data(data_subset, las, use_ascii_delimiter=False, ascii_output=True)
+            formatted_data = format_data(data_subset, step, use_ascii_delimiter=False, ascii_output=True,
+                                         cell_cache=cell_cache)
             if formatted_data:
                 formatted_data[-1] = formatted_data[-1].rstrip("\n")
             content = ascii_header + formatted_data
@@ -698,7 +1769,389 @@ def generate_output_files(selected_options, las_dir, ascii_dir, data_buffer, dat
                 update_progress(f"{filename} generated and saved successfully.")
             except Exception as e:
                 update_progress(f"Error saving {filename}: {e}")
+            write_qc_report(cell_cache.qc(data_subset, step), ascii_dir, filename, update_progress)
+            layout_written(step)
+
+        elif option.split()[0] in COLUMNAR_FORMATS and columnar_dir:
+            output_format, step_name = option.split()
+            # The 1m LAS buffer carries the NPD codes and depth fixes when LAS 1m is selected
+            step, data_subset = {"0.5m": (0.5, data_buffer), "1m": (1.0, data_one_meter_las), "5m": (5.0, data_five_meter)}[step_name]
+            filename = f"MUD_LOG_{step_name}{COLUMNAR_FORMATS[output_format]}"
+            if data_subset is None or data_subset.size == 0:
+                update_progress(f"No {step_name} data available; {filename} skipped.")
+                continue
+            update_progress(f"{output_format} {step_name} components prepared for generation\n Please wait...")
+            metadata = dict(well_metadata or {})
+            metadata.update({"STRT": data_subset[0, 0], "STOP": data_subset[-1, 0], "STEP": f"{step:.1f}"})
+            save_path = os.path.join(columnar_dir, filename)
+            try:
+                write_columnar_file(data_subset, output_format, save_path, metadata)
+                update_progress(f"{filename} generated and saved successfully.")
+            except Exception as e:
+                update_progress(f"Error saving {filename}: {e}")
+
+
+# ----------------- CAMPAIGN INDEX -----------------#
+def summarize_depth_blocks(data_subset, block_meters=INDEX_BLOCK_METERS):
+    """Return the top depth, per-curve min/max and valid-value count of every depth block of a buffer."""
+    values = np.where(data_subset == NULL_VALUE, np.nan, np.asarray(data_subset, dtype=float))
+    values = values[~np.isnan(values[:, 0])]
+    values = values[np.argsort(values[:, 0], kind="stable")]
+    blocks = np.floor(values[:, 0] / block_meters)
+    starts = np.flatnonzero(np.r_[True, blocks[1:] != blocks[:-1]]) if len(blocks) else np.empty(0, dtype=int)
+    if not len(starts):
+        empty = np.empty((0, values.shape[1]))
+        return np.empty(0), empty, empty, empty.astype(np.int32)
+    return (blocks[starts] * block_meters, np.fmin.reduceat(values, starts, axis=0), np.fmax.reduceat(values, starts, axis=0),
+            np.add.reduceat(~np.isnan(values), starts, axis=0).astype(np.int32))
+
+def values_as_written(data_subset):
+    """Return the data rounded to the decimals of each output column, i.e. the values stored in the file text."""
+    scale = 10.0 ** COLUMN_DECIMALS[:data_subset.shape[1]]
+    scaled = data_subset * scale
+    rounded = np.rint(scaled) / scale
+    # printf rounds halfway cases by their exact binary value, so only the cells close to a tie are formatted
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for j in np.nonzero(ties.any(axis=0))[0]:
+        rows = np.nonzero(ties[:, j])[0]
+        rounded[rows, j] = np.char.mod(COLUMN_VALUE_FORMATS[j], data_subset[rows, j]).astype(float)
+    return np.where(data_subset == NULL_VALUE, NULL_VALUE, rounded)
+
+def write_index_entry(las_path, data_subset, metadata):
+    """Write the campaign index sidecar of a LAS file from its data buffer (template curve order).
+
+    The values are summarized as written to the file, so the sidecar of a generated file matches a later --index rebuild.
+    """
+    tops, mins, maxs, counts = summarize_depth_blocks(values_as_written(data_subset))
+    stat = os.stat(las_path)
+    header = {field: str(metadata[field]) for field in INDEX_HEADER_FIELDS if field in metadata}
+    header.update({"SOURCE": os.path.basename(las_path), "MTIME_NS": stat.st_mtime_ns, "SIZE": stat.st_size, "BLOCK": INDEX_BLOCK_METERS})
+    with open(las_path + INDEX_SUFFIX, "wb") as f:
+        np.savez_compressed(f, mnemonics=np.array(TEMPLATE_MNEMONICS), tops=tops, mins=mins, maxs=maxs, counts=counts,
+                            header=np.array(json.dumps(header)))
+
+def read_index_entry(index_path):
+    """Load a campaign index sidecar as a dict of its arrays plus the decoded header."""
+    with np.load(index_path) as z:
+        entry = {key: z[key] for key in ("tops", "mins", "maxs", "counts")}
+        entry["mnemonics"] = [str(m) for m in z["mnemonics"]]
+        entry["header"] = json.loads(str(z["header"]))
+    return entry
 
+def index_entry_is_current(las_path, header=None):
+    """Return True if the LAS file has a sidecar (or the given sidecar header) written after its last change."""
+    try:
+        if header is None:
+            with np.load(las_path + INDEX_SUFFIX) as z:
+                header = json.loads(str(z["header"]))
+        stat = os.stat(las_path)
+    except (OSError, ValueError, KeyError):
+        return False
+    return header.get("MTIME_NS") == stat.st_mtime_ns and header.get("SIZE") == stat.st_size
+
+def index_las_file(las_path):
+    """Index an existing LAS file by reading it once and projecting it onto the template curves."""
+    data, _, las = load_las_input(las_path)
+    data = CurveSchema([curve.mnemonic.upper() for curve in las.curves]).project(data)
+    metadata = {field: las.well[field].value for field in INDEX_HEADER_FIELDS if field in las.well}
+    # CREA is written to the ~VERSION block
+    if "CREA" in las.version:
+        metadata["CREA"] = las.version["CREA"].value
+    write_index_entry(las_path, data, metadata)
+
+def iter_las_outputs(directories):
+    """Yield every LAS file found under the given directories."""
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".las"):
+                    yield os.path.join(root, name)
+
+def build_campaign_index(directories, update_progress, rebuild=False):
+    """Write missing or outdated index sidecars for every LAS file under the output directories."""
+    indexed = skipped = 0
+    for las_path in iter_las_outputs(directories):
+        if not rebuild and index_entry_is_current(las_path):
+            skipped += 1
+            continue
+        try:
+            index_las_file(las_path)
+            indexed += 1
+        except Exception as e:
+            update_progress(f"Could not index {las_path}: {e}")
+    update_progress(f"Campaign index: {indexed} LAS file(s) indexed, {skipped} already up to date.")
+
+class CampaignIndex:
+    """Block summaries of all indexed LAS files under a set of directories, loaded once for repeated queries."""
+    def __init__(self, directories):
+        self.entries = []
+        self.stale = []
+        for las_path in iter_las_outputs(directories):
+            if not os.path.exists(las_path + INDEX_SUFFIX):
+                continue
+            entry = read_index_entry(las_path + INDEX_SUFFIX)
+            if index_entry_is_current(las_path, entry["header"]):
+                entry["path"] = las_path
+                self.entries.append(entry)
+            else:
+                self.stale.append(las_path)
+
+    def query(self, mnemonic, top, base, below=None, above=None):
+        """Return (path, header, min, max) of the files whose curve goes below/above the thresholds in [top, base).
+
+        Matching is at block resolution: blocks overlapping the range count as a whole.
+        """
+        mnemonic = MNEMONIC_ALIASES.get(mnemonic.upper(), mnemonic.upper())
+        matches = []
+        for entry in self.entries:
+            if mnemonic not in entry["mnemonics"]:
+                continue
+            column = entry["mnemonics"].index(mnemonic)
+            block = float(entry["header"].get("BLOCK", INDEX_BLOCK_METERS))
+            selected = (entry["tops"] < base) & (entry["tops"] + block > top) & (entry["counts"][:, column] > 0)
+            if not selected.any():
+                continue
+            low, high = entry["mins"][selected, column].min(), entry["maxs"][selected, column].max()
+            if (below is None or low < below) and (above is None or high > above):
+                matches.append((entry["path"], entry["header"], float(low), float(high)))
+        return matches
+
+def print_campaign_query(directories, mnemonic, top, base, below=None, above=None):
+    """Answer a campaign query from the index sidecars and print one line per matching file."""
+    started = time.perf_counter()
+    index = CampaignIndex(directories)
+    matches = index.query(mnemonic, top, base, below, above)
+    for path, header, low, high in matches:
+        print(f"{header.get('WELL', '?'):<24} {header.get('STEP', '?'):>5}  min {low:<12g} max {high:<12g} {path}")
+    print(f"{len(matches)} of {len(index.entries)} indexed file(s) matched in {(time.perf_counter() - started) * 1000:.1f} ms.")
+    if index.stale:
+        print(f"{len(index.stale)} file(s) changed since they were indexed and were skipped; rerun with --index to refresh them.")
+
+
+# ----------------- HTTP JOB SERVICE -----------------#
+class ParsedInputCache:
+    """Thread-safe LRU cache of parsed LAS inputs shared by all service jobs."""
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.key_locks = {}
+        self.lock = threading.Lock()
+    def get(self, file_path, step):
+        """Return (data copy, curve index map, LAS object), parsing the file only if it changed on disk."""
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, step)
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        # Jobs asking for the same file wait for a single parse instead of parsing it twice
+        with key_lock:
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    self.entries.move_to_end(key)
+            if entry is None:
+                entry = load_las_input(file_path, step)
+                with self.lock:
+                    self.entries[key] = entry
+                    while len(self.entries) > self.max_entries:
+                        evicted_key, _ = self.entries.popitem(last=False)
+                        self.key_locks.pop(evicted_key, None)
+        data, curve_index_map, las = entry
+        return data.copy(), curve_index_map, las
+
+def validate_job_spec(spec):
+    """Check a job request and return it with numeric step keys; raises ValueError on bad input."""
+    if not isinstance(spec, dict):
+        raise ValueError("Job request must be a JSON object.")
+    selected_options = spec.get("selected_options") or []
+    allowed_options = OUTPUT_OPTIONS + [f"{fmt} {step_name}" for fmt in COLUMNAR_FORMATS for step_name in ("0.5m", "1m", "5m")]
+    unknown = [opt for opt in selected_options if opt not in allowed_options]
+    if not selected_options or unknown:
+        raise ValueError(f"selected_options must be a non-empty list of {allowed_options}.")
+    splice_rule = spec.get("splice_rule", SPLICE_RULES[0])
+    if splice_rule not in SPLICE_RULES:
+        raise ValueError(f"splice_rule must be one of {SPLICE_RULES}.")
+    # A list of LAS runs for a step (oldest first) is spliced into one log
+    input_files = {float(step): {"runs": list(path), "rule": splice_rule} if isinstance(path, list) else path
+                   for step, path in (spec.get("input_files") or {}).items()}
+    missing = [step for step in required_steps_for(selected_options) if not input_files.get(step)]
+    if missing:
+        raise ValueError(f"input_files is missing LAS files for step size(s): {missing}.")
+    header_answers = spec.get("header_answers")
+    if (not isinstance(header_answers, list) or len(header_answers) != 5
+            or not all(isinstance(ans, str) and ans.strip() for ans in header_answers)):
+        raise ValueError("header_answers must be a list of 5 non-empty strings: company, well, field, rig name and rig type.")
+    header_answers = [ans.strip() for ans in header_answers]
+    header_answers[2:] = [ans.upper() for ans in header_answers[2:]]
+    actual_depths = spec.get("actual_depths")
+    if "LAS 1m" in selected_options:
+        if not actual_depths or len(actual_depths) != 2:
+            raise ValueError("actual_depths [start depth, TD] is required for LAS 1m.")
+        actual_depths = [float(str(depth).replace(",", ".")) for depth in actual_depths]
+    else:
+        actual_depths = None
+    bin_aggregations = spec.get("bin_aggregations") or {}
+    if not isinstance(bin_aggregations, dict):
+        raise ValueError("bin_aggregations must be an object mapping curve mnemonics to aggregations.")
+    bin_aggregations = {str(mnemonic).upper(): agg for mnemonic, agg in bin_aggregations.items()}
+    bad_aggregations = [f"{mnemonic}: {agg}" for mnemonic, agg in bin_aggregations.items()
+                        if mnemonic not in TEMPLATE_INDEX or agg not in BIN_AGGREGATIONS]
+    if bad_aggregations:
+        raise ValueError(f"bin_aggregations has unknown curves or aggregations ({', '.join(bad_aggregations)}); "
+                         f"use HEADER_TEMPLATE mnemonics and one of {BIN_AGGREGATIONS}.")
+    return {
+        "selected_options": list(selected_options),
+        "input_files": {step: input_files[step] for step in required_steps_for(selected_options)},
+        "header_answers": header_answers,
+        "actual_depths": actual_depths,
+        "npd_file": spec.get("npd_file") if "LAS 1m" in selected_options else None,
+        "bin_aggregations": bin_aggregations,
+    }
+
+def run_generation_job(spec, output_dir, update_progress, input_cache=None):
+    """Run steps 2 and 6-9 of the wizard without a UI for a validated job spec."""
+    selected_options = {option: True for option in spec["selected_options"]}
+    las_data_buffers, curve_index_map = load_step_inputs(spec["input_files"], update_progress, input_cache,
+                                                         spec["bin_aggregations"])
+    npd_result = (False, None)
+    if spec["npd_file"]:
+        npd_result = (True, read_npd_codes(spec["npd_file"]))
+        update_progress("NPD file processed successfully.")
+    data_half_meter, data_one_meter_las, data_one_meter_ascii, data_five_meter = process_data_buffer(
+        las_data_buffers.get(0.5, np.empty((0, 0))), las_data_buffers.get(1.0, np.empty((0, 0))),
+        las_data_buffers.get(5.0, np.empty((0, 0))), curve_index_map, npd_result, update_progress, selected_options
+    )
+    apply_actual_depths(data_one_meter_las, spec["actual_depths"], update_progress)
+    date_string = datetime.now().strftime("%m/%d/%Y")
+    header_lines = {}
+    for step_value, option in ((0.5, "LAS 0.5m"), (1.0, "LAS 1m"), (5.0, "LAS 5m")):
+        header_lines[step_value] = (build_header_lines(spec["header_answers"], las_data_buffers[step_value], date_string)
+                                    if option in selected_options else None)
+    generate_output_files(selected_options, output_dir, output_dir,
+                          data_half_meter, data_one_meter_las, data_one_meter_ascii, data_five_meter,
+                          header_lines[0.5], header_lines[1.0], header_lines[5.0], update_progress,
+                          columnar_dir=output_dir, well_metadata=build_well_metadata(spec["header_answers"], date_string))
+
+class GenerationJobService:
+    """Queue EOWR generation jobs onto a bounded worker pool; each job writes into its own folder."""
+    def __init__(self, output_root, max_workers=2, max_queued_jobs=16, cache_entries=8):
+        self.output_root = output_root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eowr-job")
+        # Running plus waiting jobs never exceed this; further submissions are refused
+        self.slots = threading.BoundedSemaphore(max_workers + max_queued_jobs)
+        self.input_cache = ParsedInputCache(cache_entries)
+        self.jobs = {}
+        self.lock = threading.Lock()
+    def submit(self, spec):
+        """Validate and queue a job; returns its id, or None when the queue is full."""
+        spec = validate_job_spec(spec)
+        if not self.slots.acquire(blocking=False):
+            return None
+        job_id = uuid.uuid4().hex[:12]
+        with self.lock:
+            self.jobs[job_id] = {"job_id": job_id, "status": "queued", "messages": [], "files": [], "error": None,
+                                 "submitted": datetime.now().isoformat(timespec="seconds")}
+        self.executor.submit(self._run, job_id, spec)
+        return job_id
+    def _run(self, job_id, spec):
+        job = self.jobs[job_id]
+        job["status"] = "running"
+        output_dir = os.path.join(self.output_root, job_id)
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            run_generation_job(spec, output_dir, job["messages"].append, self.input_cache)
+            job["files"] = sorted(os.listdir(output_dir))
+            job["status"] = "finished"
+        except Exception as e:
+            job["error"] = str(e)
+            job["status"] = "failed"
+        finally:
+            self.slots.release()
+    def status(self, job_id=None):
+        """Return a snapshot of one job, or of all jobs when no id is given."""
+        with self.lock:
+            if job_id is None:
+                return [dict(job, messages=list(job["messages"])) for job in self.jobs.values()]
+            job = self.jobs.get(job_id)
+            return None if job is None else dict(job, messages=list(job["messages"]))
+    def file_path(self, job_id, filename):
+        """Return the path of a produced file, or None if the job has no such file."""
+        job = self.status(job_id)
+        if job is None or filename not in job["files"]:
+            return None
+        return os.path.join(self.output_root, job_id, filename)
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """REST endpoints: POST /jobs, GET /jobs, GET /jobs/<id>, GET /jobs/<id>/files/<name>."""
+    def send_json(self, status_code, payload):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self.send_json(404, {"error": "Not found."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job_id = self.server.job_service.submit(json.loads(self.rfile.read(length) or b"{}"))
+        except (ValueError, TypeError, AttributeError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        if job_id is None:
+            self.send_json(503, {"error": "Job queue is full. Please try again later."})
+            return
+        self.send_json(202, {"job_id": job_id, "status": "queued"})
+    def do_GET(self):
+        parts = [unquote(part) for part in urlparse(self.path).path.split("/") if part]
+        service = self.server.job_service
+        if parts == ["jobs"]:
+            self.send_json(200, service.status())
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = service.status(parts[1])
+            if job is None:
+                self.send_json(404, {"error": "Unknown job."})
+            else:
+                self.send_json(200, job)
+        elif len(parts) == 4 and parts[0] == "jobs" and parts[2] == "files":
+            file_path = service.file_path(parts[1], parts[3])
+            if file_path is None:
+                self.send_json(404, {"error": "Unknown job or file."})
+                return
+            with open(file_path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Disposition", f'attachment; filename="{parts[3]}"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_json(404, {"error": "Not found."})
+
+def create_job_server(host, port, output_root, max_workers=2, max_queued_jobs=16):
+    """Create the HTTP job server; call serve_forever() on it, and shutdown() plus job_service.shutdown() to stop."""
+    os.makedirs(output_root, exist_ok=True)
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.job_service = GenerationJobService(output_root, max_workers=max_workers, max_queued_jobs=max_queued_jobs)
+    return server
+
+def serve(host, port, output_root, max_workers, max_queued_jobs):
+    """Run the job service until interrupted."""
+    server = create_job_server(host, port, output_root, max_workers, max_queued_jobs)
+    print(f"EOWR job service listening on http://{server.server_address[0]}:{server.server_address[1]} "
+          f"({max_workers} workers, outputs in {os.path.abspath(output_root)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.job_service.shutdown()
 
 # ----------------- MAIN FUNCTION WITH STEP NAVIGATION -----------------#
 def main():
@@ -731,53 +2184,88 @@ def main():
     update_progress("Application started.")
     results = {}
 
+    # Forward messages of the background input prefetch to the progress panel
+    def drain_prefetch():
+        prefetch = results.get('prefetch')
+        if prefetch is None:
+            return None
+        while True:
+            try:
+                status, payload = prefetch.queue.get_nowait()
+            except queue.Empty:
+                break
+            if status == 'PROGRESS':
+                update_progress(payload)
+            else:
+                prefetch.outcome = (status, payload)
+                if status == 'ERROR':
+                    update_progress(f"Error while preparing the input files: {payload}")
+                    messagebox.showerror("Input Error", f"{payload}\n\nPlease select the input files again.")
+                    # Close the open dialog; the step loop then returns to the input file selection
+                    for child in workflow_frame.winfo_children():
+                        child.destroy()
+        return prefetch.outcome
+    def prefetch_failed():
+        prefetch = results.get('prefetch')
+        return prefetch is not None and prefetch.outcome is not None and prefetch.outcome[0] == 'ERROR'
+    def poll_prefetch():
+        drain_prefetch()
+        root.after(200, poll_prefetch)
+    root.after(200, poll_prefetch)
+
     # Helper function to reset results from a given step
     def reset_results_from(step):
         keys_by_step = {
-            1: ['selected_options', 'selected_files', 'las_data_buffers', 'curve_index_map', 'las_object', 'header_answers', 'actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'las_dir', 'ascii_dir'],
-            2: ['selected_files', 'las_data_buffers', 'curve_index_map', 'las_object', 'header_answers', 'actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'las_dir', 'ascii_dir'],
-            3: ['header_answers', 'actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'las_dir', 'ascii_dir'],
-            4: ['actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'las_dir', 'ascii_dir'],
-            5: ['npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'las_dir', 'ascii_dir'],
-            6: ['data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'las_dir', 'ascii_dir'],
-            7: ['modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'las_dir', 'ascii_dir'],
-            8: ['las_dir', 'ascii_dir']
+            1: ['selected_options', 'selected_files', 'bin_aggregations', 'prefetch', 'las_data_buffers', 'curve_index_map', 'header_answers', 'actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'well_metadata', 'las_dir', 'ascii_dir', 'columnar_dir'],
+            2: ['selected_files', 'bin_aggregations', 'prefetch', 'las_data_buffers', 'curve_index_map', 'header_answers', 'actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'well_metadata', 'las_dir', 'ascii_dir', 'columnar_dir'],
+            3: ['header_answers', 'actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'well_metadata', 'las_dir', 'ascii_dir', 'columnar_dir'],
+            4: ['actual_depths', 'npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'well_metadata', 'las_dir', 'ascii_dir', 'columnar_dir'],
+            5: ['npd_result', 'data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'well_metadata', 'las_dir', 'ascii_dir', 'columnar_dir'],
+            6: ['data_half_meter', 'data_one_meter', 'data_five_meter', 'modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'well_metadata', 'las_dir', 'ascii_dir', 'columnar_dir'],
+            7: ['modified_header_lines0_5', 'modified_header_lines1', 'modified_header_lines5', 'well_metadata', 'las_dir', 'ascii_dir', 'columnar_dir'],
+            8: ['las_dir', 'ascii_dir', 'columnar_dir']
         }
         for key in keys_by_step.get(step, []):
             if key in results:
+                if key == 'prefetch':
+                    results[key].kwargs['cancel_event'].set()
                 del results[key]
 
     step = 1
     while True:
+        if prefetch_failed():
+            reset_results_from(2)
+            step = 2
+            continue
         if step == 1:
             selected_options = select_output_options(workflow_frame, update_progress)
             results['selected_options'] = selected_options
             step = 2
         elif step == 2:
-            selected_files = select_las_file(workflow_frame, update_progress, results['selected_options'])
-            if selected_files == "BACK":
+            selection = select_las_file(workflow_frame, update_progress, results['selected_options'])
+            if selection == "BACK":
                 reset_results_from(2)
                 step = 1
                 continue
+            if prefetch_failed():
+                continue  # The dialog was closed by a failed prefetch of the previous selection
+            selected_files, bin_aggregations = selection
+            if ('prefetch' in results and results.get('selected_files') == selected_files
+                    and results.get('bin_aggregations') == bin_aggregations):
+                update_progress("Input files unchanged; keeping the files prepared in the background.")
+            else:
+                if 'prefetch' in results:
+                    results['prefetch'].kwargs['cancel_event'].set()  # Other files were picked after going Back
+                # Parse and process the inputs while the user answers the next dialogs
+                prefetch = FileGenerationThread(prefetch_step_inputs, args=(selected_files, results['selected_options']),
+                                                kwargs={'bin_aggregations': bin_aggregations, 'cancel_event': threading.Event()})
+                prefetch.daemon = True
+                prefetch.outcome = None
+                prefetch.start()
+                results['prefetch'] = prefetch
+                update_progress("Input files are being prepared in the background...")
             results['selected_files'] = selected_files
-            las_data_buffers = {}
-            counter = 0
-            las_object = None
-            for s, file_path in selected_files.items():
-                try:
-                    las = lasio.read(file_path)
-                    las_data_buffers[s] = np.array(las.data.copy())
-                    update_progress(f"LAS input file for {s} m imported.")
-                    if counter == 0:
-                        curve_index_map = {curve.mnemonic.upper(): idx for idx, curve in enumerate(las.curves)}
-                        las_object = las
-                        counter += 1
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to read LAS file for {s} m.\nError: {str(e)}")
-                    sys.exit(1)
-            results['las_data_buffers'] = las_data_buffers
-            results['curve_index_map'] = curve_index_map
-            results['las_object'] = las_object
+            results['bin_aggregations'] = bin_aggregations
             step = 3
         elif step == 3:
             header_answers = collect_header_info(workflow_frame, update_progress)
@@ -811,22 +2299,22 @@ def main():
                 results['npd_result'] = (False, None)
             step = 6
         elif step == 6:
-            # Use fresh copies of the raw data for processing
-            db0_5 = results['las_data_buffers'].get(0.5, np.empty((0,0))).copy()
-            db1 = results['las_data_buffers'].get(1.0, np.empty((0,0))).copy()
-            db5 = results['las_data_buffers'].get(5.0, np.empty((0,0))).copy()
-            data_half_meter, data_one_meter_las, data_one_meter_ascii, data_five_meter = process_data_buffer(
-                db0_5, db1, db5,
-                results['curve_index_map'], results['npd_result'], update_progress,
-                results['selected_options']
-            )
-            if results['actual_depths'] is not None and data_one_meter_las is not None:
-                if data_one_meter_las.shape[0] > 0 and data_one_meter_las[-1, 0] > float(results['actual_depths'][1]):
-                    update_progress("Detected: Last row of 1m LAS depth > actual TD")
-                    data_one_meter_las[-1, 3:] = NULL_VALUE
-                if data_one_meter_las.shape[0] > 0 and data_one_meter_las[0, 0] < float(results['actual_depths'][0]):
-                    update_progress("Detected: First row of 1m LAS depth < actual start depth")
-                    data_one_meter_las[0, 3:] = NULL_VALUE
+            while drain_prefetch() is None:
+                results['prefetch'].join(timeout=0.05)
+                root.update()
+            status, prefetched = results['prefetch'].outcome
+            if status == 'ERROR':
+                continue  # Already reported; the loop returns to step 2
+            results['las_data_buffers'] = prefetched['las_data_buffers']
+            results['curve_index_map'] = prefetched['curve_index_map']
+            data_half_meter = prefetched['data_half_meter']
+            data_five_meter = prefetched['data_five_meter']
+            data_one_meter_ascii = prefetched['data_one_meter']
+            # The LAS 1m version adds the NPD codes and depth fixes, which depend on steps 4 and 5
+            data_one_meter_las = data_one_meter_ascii.copy()
+            if "LITH" in results['curve_index_map'] and data_one_meter_las.size:
+                apply_npd_codes(data_one_meter_las, results['npd_result'], update_progress)
+            apply_actual_depths(data_one_meter_las, results['actual_depths'], update_progress)
 
             results['data_half_meter'] = data_half_meter
             results['data_one_meter_las'] = data_one_meter_las
@@ -842,60 +2330,13 @@ def main():
         elif step == 7:
             today = datetime.now()
             date_string = today.strftime("%m/%d/%Y")
-            if "LAS 0.5m" in results['selected_options']:
-                field_mapping0_5 = {
-                    "COMP": results['header_answers'][0], "WELL": results['header_answers'][1],
-                    "STRT": str(results['las_data_buffers'][0.5][0, 0]), "STOP": str(results['las_data_buffers'][0.5][-1, 0]),
-                    "FLD": results['header_answers'][2], "RIGN": results['header_answers'][3],
-                    "RIGTYP": results['header_answers'][4], "CREA.": date_string
-                }
-                header_lines0_5 = HEADER_TEMPLATE.splitlines(keepends=True)
-                modified_header_lines0_5 = header_lines0_5.copy()
-                for field, new_value in field_mapping0_5.items():
-                    for i, line in enumerate(modified_header_lines0_5):
-                        if field in line.split():
-                            padded_value = new_value + " " * (20 - len(new_value)) if len(new_value) < 21 else new_value + " "
-                            modified_header_lines0_5[i] = line.replace("XX", padded_value, 1)
-                            break
-                results['modified_header_lines0_5'] = modified_header_lines0_5
-            else:
-                results['modified_header_lines0_5'] = None
-            if "LAS 1m" in results['selected_options']:
-                field_mapping1 = {
-                    "COMP": results['header_answers'][0], "WELL": results['header_answers'][1],
-                    "STRT": str(results['las_data_buffers'][1.0][0, 0]), "STOP": str(results['las_data_buffers'][1.0][-1, 0]),
-                    "FLD": results['header_answers'][2], "RIGN": results['header_answers'][3],
-                    "RIGTYP": results['header_answers'][4], "CREA.": date_string
-                }
-                header_lines1 = HEADER_TEMPLATE.splitlines(keepends=True)
-                modified_header_lines1 = header_lines1.copy()
-                for field, new_value in field_mapping1.items():
-                    for i, line in enumerate(modified_header_lines1):
-                        if field in line.split():
-                            padded_value = new_value + " " * (20 - len(new_value)) if len(new_value) < 21 else new_value + " "
-                            modified_header_lines1[i] = line.replace("XX", padded_value, 1)
-                            break
-                results['modified_header_lines1'] = modified_header_lines1
-            else:
-                results['modified_header_lines1'] = None
-            if "LAS 5m" in results['selected_options']:
-                field_mapping5 = {
-                    "COMP": results['header_answers'][0], "WELL": results['header_answers'][1],
-                    "STRT": str(results['las_data_buffers'][5.0][0, 0]), "STOP": str(results['las_data_buffers'][5.0][-1, 0]),
-                    "FLD": results['header_answers'][2], "RIGN": results['header_answers'][3],
-                    "RIGTYP": results['header_answers'][4], "CREA.": date_string
-                }
-                header_lines5 = HEADER_TEMPLATE.splitlines(keepends=True)
-                modified_header_lines5 = header_lines5.copy()
-                for field, new_value in field_mapping5.items():
-                    for i, line in enumerate(modified_header_lines5):
-                        if field in line.split():
-                            padded_value = new_value + " " * (20 - len(new_value)) if len(new_value) < 21 else new_value + " "
-                            modified_header_lines5[i] = line.replace("XX", padded_value, 1)
-                            break
-                results['modified_header_lines5'] = modified_header_lines5
-            else:
-                results['modified_header_lines5'] = None
+            for step_key, step_value, option in (("0_5", 0.5, "LAS 0.5m"), ("1", 1.0, "LAS 1m"), ("5", 5.0, "LAS 5m")):
+                if option in results['selected_options']:
+                    results[f'modified_header_lines{step_key}'] = build_header_lines(
+                        results['header_answers'], results['las_data_buffers'][step_value], date_string)
+                else:
+                    results[f'modified_header_lines{step_key}'] = None
+            results['well_metadata'] = build_well_metadata(results['header_answers'], date_string)
             step = 8
         elif step == 8:
             output_dirs = select_output_directories(workflow_frame, results['selected_options'])
@@ -903,13 +2344,14 @@ def main():
                 reset_results_from(8)
                 step = 5 if "LAS 1m" in results['selected_options'] else 3
                 continue
-            results['las_dir'], results['ascii_dir'] = output_dirs
+            results['las_dir'], results['ascii_dir'], results['columnar_dir'] = output_dirs
             step = 9
         elif step == 9:
             generate_output_files(results['selected_options'], results['las_dir'], results['ascii_dir'],
                                   results['data_half_meter'], results['data_one_meter_las'], results['data_one_meter_ascii'], results['data_five_meter'],
-                                  results['las_object'].curves, results['modified_header_lines0_5'],
-                                  results['modified_header_lines1'], results['modified_header_lines5'], update_progress)
+                                  results['modified_header_lines0_5'], results['modified_header_lines1'], results['modified_header_lines5'],
+                                  update_progress,
+                                  columnar_dir=results['columnar_dir'], well_metadata=results['well_metadata'])
 
             update_progress("LAS/ASCII Processing completed. Please find the output file(s) in the selected path(s). \n Click 'Close' to exit.")
             close_button = tk.Button(workflow_frame, text="Close", font=("Arial", 12, "bold"),
@@ -920,4 +2362,30 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
+    multiprocessing.freeze_support()  # Parallel LAS export workers in frozen (packaged) builds
+    parser = argparse.ArgumentParser(description="EOWR LAS/ASCII Generator")
+    parser.add_argument("--serve", action="store_true", help="run the local HTTP job service instead of the wizard")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="number of jobs processed at the same time")
+    parser.add_argument("--queue-size", type=int, default=16, help="jobs allowed to wait for a free worker")
+    parser.add_argument("--output-root", default="eowr_jobs", help="folder receiving one sub-folder per job")
+    parser.add_argument("--index", nargs="+", metavar="DIR", help="campaign folders; their LAS outputs are indexed unless --query is given")
+    parser.add_argument("--rebuild", action="store_true", help="re-index every file, including those already up to date")
+    parser.add_argument("--query", metavar="MNEMONIC", help="query the existing campaign index of the --index folders for a curve")
+    parser.add_argument("--top", type=float, default=0.0, help="query range top depth (m)")
+    parser.add_argument("--base", type=float, default=float("inf"), help="query range base depth (m)")
+    parser.add_argument("--below", type=float, help="match files where the curve goes below this value")
+    parser.add_argument("--above", type=float, help="match files where the curve goes above this value")
+    args = parser.parse_args()
+    if args.query and not args.index:
+        parser.error("--query needs the folders to search in --index")
+    if args.index:
+        if args.rebuild or not args.query:
+            build_campaign_index(args.index, print, args.rebuild)
+        if args.query:
+            print_campaign_query(args.index, args.query, args.top, args.base, args.below, args.above)
+    elif args.serve:
+        serve(args.host, args.port, args.output_root, args.workers, args.queue_size)
+    else:
+        main()